@@ -4,37 +4,185 @@ import streamlit as st
 st.set_page_config(page_title="🏡 AI Remodel Cost Estimator", layout="wide")
 
 import os
-import json
-import pandas as pd
-from utils.env_loader import load_env_vars
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from utils.env_loader import get_env_path, load_env_vars
+from utils import fast_json
+
+def _env_file_mtime():
+    """Return the .env file's modification time, or None if it is missing."""
+    try:
+        return os.path.getmtime(get_env_path())
+    except OSError:
+        return None
+
+@st.cache_resource(show_spinner=False)
+def _bootstrap_env(env_mtime) -> bool:
+    """Load the .env file once per version of the file rather than on every rerun.
+
+    Keyed on the file's modification time, so saving .env reloads it on the
+    next rerun. As with load_dotenv's defaults, variables that are already
+    set keep their values; new variables are picked up. A failed load
+    raises so it isn't cached.
+    """
+    if not load_env_vars():
+        raise FileNotFoundError(get_env_path())
+    return True
 
 # Load environment variables properly
-if not load_env_vars():
+try:
+    _bootstrap_env(_env_file_mtime())
+except FileNotFoundError:
     st.error("Failed to load environment variables. Please check your .env file.")
     st.stop()
 
-# Initialize LangSmith if available
-LANGSMITH_API_KEY = os.environ.get("LANGSMITH_API_KEY")
-LANGSMITH_PROJECT = os.environ.get("LANGSMITH_PROJECT", "renovation-estimator")
-if LANGSMITH_API_KEY:
-    from langsmith import Client
-    langsmith_client = Client(api_key=LANGSMITH_API_KEY)
-    print(f"LangSmith initialized with project: {LANGSMITH_PROJECT}")
+# Regional cost context messages
+_COST_ABOVE_20 = "Average renovation costs in your area are 20% above national average"
+_COST_ABOVE_10 = "Average renovation costs in your area are 10% above national average"
+_COST_BELOW_15 = "Average renovation costs in your area are 15% below national average"
+_COST_NEAR_AVG = "Average renovation costs in your area are near the national average"
+
+# (region, cost context) keyed by the first digit of the ZIP code
+ZIP_INFO = MappingProxyType({
+    "0": ("New England", _COST_ABOVE_10),
+    "1": ("Northeast", _COST_ABOVE_10),
+    "2": ("Mid-Atlantic", _COST_NEAR_AVG),
+    "3": ("Southeast", _COST_NEAR_AVG),
+    "4": ("Midwest", _COST_BELOW_15),
+    "5": ("Midwest", _COST_BELOW_15),
+    "6": ("South/Southwest", _COST_NEAR_AVG),
+    "7": ("South/Southwest", _COST_NEAR_AVG),
+    "8": ("Mountain", _COST_NEAR_AVG),
+    "9": ("West Coast", _COST_ABOVE_20)
+})
+DEFAULT_ZIP_INFO = ("Unknown", _COST_NEAR_AVG)
+
+# Scope reruns to a fragment where supported (st.fragment is 1.37+,
+# st.experimental_fragment 1.33+); older versions render normally
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda func: func)
+
+# Map frontend project type selections to backend values
+PROJECT_TYPE_MAP = MappingProxyType({
+    "Kitchen": "kitchen",
+    "Bathroom": "bathroom",
+    "Home Addition": "addition"
+})
+
+# Suggested (min, max, default) square footage by project type
+SQFT_RANGES = MappingProxyType({
+    "kitchen": (100, 300, 180),
+    "bathroom": (40, 150, 80),
+    "addition": (200, 800, 400)
+})
 
-# Import backend components
-from backend.vector_store import get_vector_store
-from backend.estimator import CostEstimator
-from backend.evaluation import evaluate_with_ragas, generate_model_comparison
+# Feature summaries shown for each material grade
+MATERIAL_DETAILS = MappingProxyType({
+    "standard": "- Mid-range appliances\n- Laminate countertops\n- Stock cabinets",
+    "premium": "- Higher-end appliances\n- Quartz countertops\n- Semi-custom cabinets",
+    "luxury": "- Top-tier appliances\n- Marble/granite countertops\n- Custom cabinets"
+})
 
 # Import utility functions
+# Backend components (LangChain, RAGAS, Pinecone) and the PDF generator are
+# imported inside the functions that use them so wizard steps 0-5 don't pay
+# their import cost on every rerun.
 from utils.vc_dashboard import render_vc_dashboard
-from utils.pdf_generator import display_pdf_html
+
+@st.cache_resource(show_spinner=False)
+def _get_estimator(use_mock: bool, use_pinecone: bool):
+    """Build the vector store and estimator once per server process."""
+    from backend.vector_store import get_vector_store
+    from backend.estimator import CostEstimator
+    
+    vector_store = get_vector_store(use_mock=use_mock, use_pinecone=use_pinecone)
+    return CostEstimator(vector_store)
+
+@st.cache_data(show_spinner=False)
+def _cached_estimate(use_mock: bool, use_pinecone: bool, zip_code: str, project_type: str,
+                     square_feet: int, material_grade: str, timeline_months: int) -> dict:
+    """Generate an estimate, reusing the result for identical wizard inputs."""
+    return _get_estimator(use_mock, use_pinecone).estimate({
+        "zip_code": zip_code,
+        "project_type": project_type,
+        "square_feet": square_feet,
+        "material_grade": material_grade,
+        "timeline_months": timeline_months
+    })
+
+@st.cache_data(show_spinner=False)
+def _cached_eval_contexts(query: str, use_mock: bool, use_pinecone: bool):
+    """Retrieve the contexts used to evaluate an estimate.
+
+    Failures propagate so st.cache_data doesn't memoize them; see
+    _eval_contexts for the fallback.
+    """
+    estimator = _get_estimator(use_mock, use_pinecone)
+    return [doc.page_content for doc in estimator.retriever.get_relevant_documents(query)]
+
+def _eval_contexts(query: str, use_mock: bool, use_pinecone: bool):
+    """Retrieve evaluation contexts, or None if retrieval fails this run."""
+    try:
+        return _cached_eval_contexts(query, use_mock, use_pinecone)
+    except Exception:
+        return None
+
+class _UncachedEvaluation(Exception):
+    """Carries a simulated evaluation out of _cached_ragas_eval uncached."""
+
+    def __init__(self, evaluation):
+        super().__init__("evaluation fell back to simulated metrics")
+        self.evaluation = evaluation
+
+@st.cache_data(show_spinner=False)
+def _cached_ragas_eval(query: str, answer_json: str, contexts):
+    """Score the answer with RAGAS.
+
+    The serialized answer is part of the cache key, so a new estimate
+    always triggers a fresh evaluation. Simulated fallback metrics are
+    raised rather than returned so st.cache_data doesn't memoize them.
+    """
+    from backend.evaluation import evaluate_with_ragas
+    
+    # Use RAGAS for evaluation with LangSmith tracing
+    evaluation = evaluate_with_ragas(
+        question=query,
+        answer=answer_json,
+        contexts=contexts
+    )
+    if evaluation.get("simulated"):
+        raise _UncachedEvaluation(evaluation)
+    return evaluation
+
+def _ragas_eval(query: str, answer_json: str, contexts):
+    """Score the answer, caching only judged (non-simulated) evaluations."""
+    try:
+        return _cached_ragas_eval(query, answer_json, contexts)
+    except _UncachedEvaluation as e:
+        return e.evaluation
+
+def _estimate_with_contexts(inputs: dict, query: str, use_mock: bool, use_pinecone: bool):
+    """Generate the estimate and retrieve evaluation contexts concurrently.
+    
+    Retrieval doesn't depend on the estimate, so it runs on a worker thread
+    while the estimate's own retrieval and LLM call run on the script
+    thread. The estimator is built here first so the two never race to
+    build it, and the worker is given the script's run context, which
+    Streamlit's caches need.
+    """
+    _get_estimator(use_mock, use_pinecone)
+    
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=1, initializer=add_script_run_ctx, initargs=(None, ctx)) as pool:
+        contexts = pool.submit(_eval_contexts, query, use_mock, use_pinecone)
+        estimate = _cached_estimate(use_mock, use_pinecone, **inputs)
+        return estimate, contexts.result()
 
 # Initialize session state
-if "step" not in st.session_state:
-    st.session_state.step = 0
-    st.session_state.inputs = {}
-    st.session_state.estimate = None
+st.session_state.setdefault("step", 0)
+st.session_state.setdefault("inputs", {})
+st.session_state.setdefault("estimate", None)
+st.session_state.setdefault("last_results", None)
 
 # Main function
 def main():
@@ -43,20 +191,9 @@ def main():
     st.title("🏡 AI Remodel Cost Estimator")
     
     # Show steps based on current state
-    if st.session_state.step == 0:
-        intro_screen()
-    elif st.session_state.step == 1:
-        zip_code_step()
-    elif st.session_state.step == 2:
-        project_type_step()
-    elif st.session_state.step == 3:
-        square_footage_step()
-    elif st.session_state.step == 4:
-        material_grade_step()
-    elif st.session_state.step == 5:
-        timeline_step()
-    elif st.session_state.step == 6:
-        results_screen()
+    step = st.session_state.step
+    if 0 <= step < len(_STEPS):
+        _STEPS[step]()
 
 # Define step functions
 def intro_screen():
@@ -70,57 +207,42 @@ def intro_screen():
     ✓ Create a shareable report for contractors
     """)
     
-    if st.button("Start Estimating", use_container_width=True):
-        st.session_state.step = 1
-        st.rerun()
+    st.button("Start Estimating", use_container_width=True, on_click=next_step)
 
 def zip_code_step():
     """Step 1: Location."""
     st.header("Step 1: Location")
     
-    col1, col2 = st.columns([3, 1])
-    with col1:
-        zip_code = st.text_input(
-            "Enter ZIP Code",
-            max_chars=5,
-            placeholder="e.g. 90210"
-        )
-    with col2:
-        if st.button("Next", disabled=not (zip_code and len(zip_code) == 5 and zip_code.isdigit())):
-            next_step(zip_code=zip_code)
+    # Use a form so typing doesn't trigger a rerun on every keystroke
+    with st.form("zip_form", clear_on_submit=False):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.text_input(
+                "Enter ZIP Code",
+                max_chars=5,
+                placeholder="e.g. 90210",
+                key="zip_code_input"
+            )
+        with col2:
+            submitted = st.form_submit_button("Next", on_click=submit_zip_code)
+    
+    # A valid submission advances the step in the callback, so reaching
+    # this point after a submit means validation failed
+    if submitted:
+        st.error("Please enter a valid 5-digit ZIP code.")
     
     # Show location-based insights
     if "zip_code" in st.session_state.inputs:
         st.success(f"Location validated: {st.session_state.inputs['zip_code']}")
         
         # Show regional context based on first digit
-        region_map = {
-            "0": "New England",
-            "1": "Northeast",
-            "2": "Mid-Atlantic",
-            "3": "Southeast",
-            "4": "Midwest",
-            "5": "Midwest",
-            "6": "South/Southwest",
-            "7": "South/Southwest",
-            "8": "Mountain",
-            "9": "West Coast"
-        }
-        
         zip_first_digit = st.session_state.inputs['zip_code'][0]
-        region = region_map.get(zip_first_digit, "Unknown")
+        region, cost_context = ZIP_INFO.get(zip_first_digit, DEFAULT_ZIP_INFO)
         
         st.info(f"Region: {region}")
         
         # Show cost context based on region
-        if zip_first_digit == "9":
-            st.info("Average renovation costs in your area are 20% above national average")
-        elif zip_first_digit in ["0", "1"]:
-            st.info("Average renovation costs in your area are 10% above national average")
-        elif zip_first_digit in ["4", "5"]:
-            st.info("Average renovation costs in your area are 15% below national average")
-        else:
-            st.info("Average renovation costs in your area are near the national average")
+        st.info(cost_context)
 
 def project_type_step():
     """Step 2: Project type."""
@@ -129,13 +251,12 @@ def project_type_step():
     # Navigation buttons
     cols = st.columns([1, 8, 1])
     with cols[0]:
-        if st.button("← Back"):
-            back_step()
+        st.button("← Back", on_click=back_step)
     
     # Project type selection
     project_type = st.radio(
         "Select renovation project type:",
-        options=["Kitchen", "Bathroom", "Home Addition"],
+        options=list(PROJECT_TYPE_MAP),
         index=0,
         horizontal=True
     )
@@ -151,17 +272,9 @@ def project_type_step():
         st.info("Home additions expand your living space with entirely new rooms or extensions.")
         st.image("https://placehold.co/600x400?text=Home+Addition", caption="Sample Home Addition")
     
-    # Map frontend selections to backend values
-    type_mapping = {
-        "Kitchen": "kitchen",
-        "Bathroom": "bathroom",
-        "Home Addition": "addition"
-    }
-    
     # Continue button
     with cols[2]:
-        if st.button("Next →"):
-            next_step(project_type=type_mapping[project_type])
+        st.button("Next →", on_click=next_step, kwargs={"project_type": PROJECT_TYPE_MAP[project_type]})
 
 def square_footage_step():
     """Step 3: Square footage."""
@@ -170,22 +283,13 @@ def square_footage_step():
     # Navigation buttons
     cols = st.columns([1, 8, 1])
     with cols[0]:
-        if st.button("← Back"):
-            back_step()
+        st.button("← Back", on_click=back_step)
     
     # Get project type for context
     project_type = st.session_state.inputs.get("project_type", "kitchen")
     
     # Suggested square footage range based on project type
-    if project_type == "kitchen":
-        min_range, max_range = 100, 300
-        default_value = 180
-    elif project_type == "bathroom":
-        min_range, max_range = 40, 150
-        default_value = 80
-    else:  # addition
-        min_range, max_range = 200, 800
-        default_value = 400
+    min_range, max_range, default_value = SQFT_RANGES.get(project_type, SQFT_RANGES["addition"])
     
     # Square footage slider
     square_feet = st.slider(
@@ -206,8 +310,7 @@ def square_footage_step():
     
     # Continue button
     with cols[2]:
-        if st.button("Next →"):
-            next_step(square_feet=square_feet)
+        st.button("Next →", on_click=next_step, kwargs={"square_feet": square_feet})
 
 def material_grade_step():
     """Step 4: Material grade."""
@@ -216,12 +319,10 @@ def material_grade_step():
     # Navigation buttons
     cols = st.columns([1, 8, 1])
     with cols[0]:
-        if st.button("← Back"):
-            back_step()
+        st.button("← Back", on_click=back_step)
     
     # Initialize the selected grade in session state if not already there
-    if "temp_material_grade" not in st.session_state:
-        st.session_state.temp_material_grade = None
+    st.session_state.setdefault("temp_material_grade", None)
     
     # Material grade selection
     col1, col2, col3 = st.columns(3)
@@ -239,23 +340,15 @@ def material_grade_step():
             st.session_state.temp_material_grade = "luxury"
     
     # Display details based on selection
-    if st.session_state.temp_material_grade == "standard":
-        st.success("✓ Standard selected")
-        st.markdown("- Mid-range appliances\n- Laminate countertops\n- Stock cabinets")
-    elif st.session_state.temp_material_grade == "premium":
-        st.success("✓ Premium selected")
-        st.markdown("- Higher-end appliances\n- Quartz countertops\n- Semi-custom cabinets")
-    elif st.session_state.temp_material_grade == "luxury":
-        st.success("✓ Luxury selected")
-        st.markdown("- Top-tier appliances\n- Marble/granite countertops\n- Custom cabinets")
+    selected_grade = st.session_state.temp_material_grade
+    if selected_grade in MATERIAL_DETAILS:
+        st.success(f"✓ {selected_grade.title()} selected")
+        st.markdown(MATERIAL_DETAILS[selected_grade])
     
     # Continue button (only show if a material grade is selected)
     if st.session_state.temp_material_grade:
         with cols[2]:
-            if st.button("Next →"):
-                next_step(material_grade=st.session_state.temp_material_grade)
-                # Clear temporary selection after moving to next step
-                st.session_state.temp_material_grade = None
+            st.button("Next →", on_click=submit_material_grade)
 
 def timeline_step():
     """Step 5: Timeline."""
@@ -264,8 +357,7 @@ def timeline_step():
     # Navigation buttons
     cols = st.columns([1, 8, 1])
     with cols[0]:
-        if st.button("← Back"):
-            back_step()
+        st.button("← Back", on_click=back_step)
     
     # Timeline selection
     timeline_months = st.radio(
@@ -285,8 +377,7 @@ def timeline_step():
     
     # Continue button
     with cols[2]:
-        if st.button("Get Estimate"):
-            next_step(timeline_months=timeline_months)
+        st.button("Get Estimate", on_click=next_step, kwargs={"timeline_months": timeline_months})
 
 def results_screen():
     """Final step: Display results."""
@@ -295,36 +386,30 @@ def results_screen():
     # Get inputs
     inputs = st.session_state.inputs
     
-    # Generate estimate if not already done
-    if st.session_state.estimate is None:
+    # Reuse the results shown on the last rerun if the inputs haven't
+    # changed; older inputs are served by the cached estimate and evaluation
+    cache_key = tuple(sorted(inputs.items()))
+    last_results = st.session_state.last_results
+    if last_results is not None and last_results[0] == cache_key:
+        entry = last_results[1]
+    else:
         with st.spinner("Generating your estimate..."):
             # Check environment variables
             use_mock = os.environ.get("MOCK_DATA", "true").lower() == "true"
             use_pinecone = os.environ.get("USE_PINECONE", "false").lower() == "true"
             
-            # Initialize vector store and estimator
-            vector_store = get_vector_store(use_mock=use_mock, use_pinecone=use_pinecone)
-            estimator = CostEstimator(vector_store)
-            
-            # Generate estimate
-            st.session_state.estimate = estimator.estimate(inputs)
+            # Generate estimate and evaluation contexts (cached per input combination)
+            query = f"Cost estimate for {inputs.get('project_type', 'kitchen')} with {inputs.get('square_feet', 200)} sq ft"
+            estimate, contexts = _estimate_with_contexts(inputs, query, use_mock, use_pinecone)
             
-            # Extract context for evaluation
-            try:
-                contexts = [doc.page_content for doc in estimator.retriever.get_relevant_documents(
-                    f"Cost estimate for {inputs.get('project_type', 'kitchen')} with {inputs.get('square_feet', 200)} sq ft"
-                )]
-            except:
-                contexts = None
+            # Evaluate with RAGAS (cached per query and answer)
+            ragas_scores = _ragas_eval(query, fast_json.dumps(estimate).decode(), contexts)
             
-            # Use RAGAS for evaluation with LangSmith tracing
-            query = f"Cost estimate for {inputs.get('project_type', 'kitchen')} with {inputs.get('square_feet', 200)} sq ft"
-            st.session_state.ragas_scores = evaluate_with_ragas(
-                question=query,
-                answer=json.dumps(st.session_state.estimate),
-                contexts=contexts
-            )
+            entry = {"estimate": estimate, "ragas_scores": ragas_scores}
+            st.session_state.last_results = (cache_key, entry)
     
+    st.session_state.estimate = entry["estimate"]
+    st.session_state.ragas_scores = entry["ragas_scores"]
     estimate = st.session_state.estimate
     
     # Display summary metrics
@@ -349,41 +434,15 @@ def results_screen():
     st.subheader("Cost Breakdown")
     breakdown = estimate["cost_breakdown"]
     
-    # Create chart data
-    chart_data = pd.DataFrame({
-        "Category": list(breakdown.keys()),
-        "Amount": list(breakdown.values())
-    })
-    
-    # Display chart
-    st.bar_chart(chart_data.set_index("Category"))
+    # Display chart (the inner dict keys provide the categories)
+    st.bar_chart({"Amount": breakdown})
     
     # Show RAGAS evaluation metrics
-    with st.expander("🔍 RAGAS Evaluation Metrics"):
-        ragas_scores = st.session_state.ragas_scores
-        if 'metrics' in ragas_scores and ragas_scores['metrics']:
-            # Create a pandas DataFrame from the metrics dictionary
-            metrics_df = pd.DataFrame({
-                'Metric': list(ragas_scores['metrics'].keys()),
-                'Score': list(ragas_scores['metrics'].values())
-            })
-            st.table(metrics_df.set_index('Metric'))
-        else:
-            # Fallback to direct access if metrics dict is not available
-            metrics_df = pd.DataFrame({
-                'Metric': ['Faithfulness', 'Answer Relevancy', 'Context Precision', 'Context Recall'],
-                'Score': [
-                    ragas_scores.get('faithfulness', 0),
-                    ragas_scores.get('answer_relevancy', 0),
-                    ragas_scores.get('context_precision', 0),
-                    ragas_scores.get('context_recall', 0)
-                ]
-            })
-            st.table(metrics_df.set_index('Metric'))
+    ragas_panel(st.session_state.ragas_scores)
     
     # Show next steps
     st.subheader("Next Steps")
-    st.write("""
+    st.markdown("""
     Now that you have your estimate, you can:
     1. Contact contractors for quotes
     2. Plan your renovation timeline
@@ -394,16 +453,31 @@ def results_screen():
     # PDF Export
     st.subheader("Export Options")
     if st.button("Download PDF Report"):
+        from utils.pdf_generator import display_pdf_html
         display_pdf_html(inputs, estimate)
     
     # Start over
-    if st.button("Start New Estimate"):
-        st.session_state.step = 0
-        st.session_state.inputs = {}
-        st.session_state.estimate = None
-        st.rerun()
+    st.button("Start New Estimate", on_click=start_over)
+
+@_fragment
+def ragas_panel(ragas_scores):
+    """RAGAS metrics expander, rerun in isolation from the rest of the page."""
+    with st.expander("🔍 RAGAS Evaluation Metrics"):
+        if 'metrics' in ragas_scores and ragas_scores['metrics']:
+            # Render the metrics dictionary directly
+            st.table({'Score': ragas_scores['metrics']})
+        else:
+            # Fallback to direct access if metrics dict is not available
+            st.table({'Score': {
+                'Faithfulness': ragas_scores.get('faithfulness', 0),
+                'Answer Relevancy': ragas_scores.get('answer_relevancy', 0),
+                'Context Precision': ragas_scores.get('context_precision', 0),
+                'Context Recall': ragas_scores.get('context_recall', 0)
+            }})
 
 # Helper functions
+# These run as widget callbacks, so Streamlit's own rerun after the click
+# already renders the new step; no explicit st.rerun() is needed.
 def next_step(**kwargs):
     """Advance to next step and save inputs."""
     # Save inputs
@@ -412,12 +486,39 @@ def next_step(**kwargs):
     
     # Move to next step
     st.session_state.step += 1
-    st.rerun()
 
 def back_step():
     """Go back to previous step."""
     st.session_state.step -= 1
-    st.rerun()
+
+def start_over():
+    """Reset the wizard to the intro screen."""
+    st.session_state.step = 0
+    st.session_state.inputs = {}
+    st.session_state.estimate = None
+
+def submit_zip_code():
+    """Advance past the location step if the submitted ZIP code is valid."""
+    zip_code = st.session_state.zip_code_input
+    if len(zip_code) == 5 and zip_code.isdigit():
+        next_step(zip_code=zip_code)
+
+def submit_material_grade():
+    """Save the selected material grade and advance to the next step."""
+    next_step(material_grade=st.session_state.temp_material_grade)
+    # Clear temporary selection after moving to next step
+    st.session_state.temp_material_grade = None
+
+# Step functions indexed by wizard step number
+_STEPS = (
+    intro_screen,
+    zip_code_step,
+    project_type_step,
+    square_footage_step,
+    material_grade_step,
+    timeline_step,
+    results_screen
+)
 
 # Run app
 if __name__ == "__main__":
@@ -1,7 +1,12 @@
-import json
-import random
 import os
+import sys
 from datetime import datetime
+import numpy as np
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import fast_json
 
 """
 Synthetic Data Generator for Renovation Cost Estimator
@@ -19,6 +24,22 @@ Key features:
 - Supports persistence to JSON for vector store retrieval
 """
 
+_PROJECT_TYPES = ("kitchen", "bathroom", "addition")
+_MATERIAL_GRADES = ("standard", "premium", "luxury")
+_ZIP_CODES = ("90210", "10001", "60601", "98101", "33139")
+
+# Realistic ranges per project type, indexed like _PROJECT_TYPES
+_SQFT_RANGES = np.array([(100, 300), (40, 150), (200, 800)])
+_COST_PER_SQFT_RANGES = np.array([(150, 350), (200, 400), (200, 500)])
+_TIMELINE_RANGES = np.array([(4, 12), (3, 8), (8, 20)])
+
+# Material multipliers, indexed like _MATERIAL_GRADES
+_MULTIPLIERS = np.array([1.0, 1.5, 2.0])
+
+# Share of the total cost going to each breakdown category
+_BREAKDOWN_KEYS = ("materials", "labor", "permits", "design", "contingency")
+_BREAKDOWN_SHARES = np.array([0.4, 0.35, 0.05, 0.1, 0.1])
+
 def generate_synthetic_data(count=20):
     """Generate synthetic renovation projects.
     
@@ -32,71 +53,51 @@ def generate_synthetic_data(count=20):
     Returns:
         list: Collection of generated project objects
     """
-    project_types = ["kitchen", "bathroom", "addition"]
-    material_grades = ["standard", "premium", "luxury"]
-    zip_codes = ["90210", "10001", "60601", "98101", "33139"]
+    # Draw every field for all projects at once
+    rng = np.random.default_rng()
+    type_idx = rng.integers(0, len(_PROJECT_TYPES), size=count)
+    material_idx = rng.integers(0, len(_MATERIAL_GRADES), size=count)
+    zip_idx = rng.integers(0, len(_ZIP_CODES), size=count)
     
-    projects = []
+    sqft = rng.integers(_SQFT_RANGES[type_idx, 0], _SQFT_RANGES[type_idx, 1], endpoint=True)
+    cost_per_sqft = rng.uniform(_COST_PER_SQFT_RANGES[type_idx, 0], _COST_PER_SQFT_RANGES[type_idx, 1])
+    timeline_weeks = rng.integers(_TIMELINE_RANGES[type_idx, 0], _TIMELINE_RANGES[type_idx, 1], endpoint=True)
     
-    # Create synthetic projects
-    for i in range(count):
-        project_type = random.choice(project_types)
-        
-        # Set realistic ranges based on project type
-        if project_type == "kitchen":
-            sqft_range = (100, 300)
-            cost_per_sqft = random.uniform(150, 350)
-            timeline_range = (4, 12)
-        elif project_type == "bathroom":
-            sqft_range = (40, 150)
-            cost_per_sqft = random.uniform(200, 400)
-            timeline_range = (3, 8)
-        else:  # addition
-            sqft_range = (200, 800)
-            cost_per_sqft = random.uniform(200, 500)
-            timeline_range = (8, 20)
-        
-        # Generate random values
-        sqft = random.randint(*sqft_range)
-        material = random.choice(material_grades)
-        zip_code = random.choice(zip_codes)
-        
-        # Calculate costs with material multiplier
-        multipliers = {"standard": 1.0, "premium": 1.5, "luxury": 2.0}
-        multiplier = multipliers[material]
-        base_cost = int(sqft * cost_per_sqft * multiplier)
-        
-        # Create breakdown
-        breakdown = {
-            "materials": int(base_cost * 0.4),
-            "labor": int(base_cost * 0.35),
-            "permits": int(base_cost * 0.05),
-            "design": int(base_cost * 0.1),
-            "contingency": int(base_cost * 0.1)
-        }
-        
-        # Create project
-        project = {
+    # Calculate costs with material multiplier
+    base_cost = (sqft * cost_per_sqft * _MULTIPLIERS[material_idx]).astype(np.int64)
+    
+    # Create breakdowns, one row per project
+    breakdowns = (base_cost[:, None] * _BREAKDOWN_SHARES).astype(np.int64)
+    
+    # All projects in a batch share one generation timestamp
+    timestamp = datetime.now().isoformat()
+    
+    # Create synthetic projects (tolist() converts to native Python ints for JSON)
+    projects = [
+        {
             "id": f"proj_{i}",
-            "text": f"{project_type} renovation with {sqft} square feet using {material} materials in {zip_code}. Total cost: ${base_cost}.",
+            "text": f"{_PROJECT_TYPES[t]} renovation with {sq} square feet using {_MATERIAL_GRADES[m]} materials in {_ZIP_CODES[z]}. Total cost: ${cost}.",
             "metadata": {
-                "project_type": project_type,
-                "square_feet": sqft,
-                "material_grade": material,
-                "zip_code": zip_code,
-                "total_cost": base_cost,
-                "cost_breakdown": breakdown,
-                "timeline_weeks": random.randint(*timeline_range),
-                "timestamp": datetime.now().isoformat()
+                "project_type": _PROJECT_TYPES[t],
+                "square_feet": sq,
+                "material_grade": _MATERIAL_GRADES[m],
+                "zip_code": _ZIP_CODES[z],
+                "total_cost": cost,
+                "cost_breakdown": dict(zip(_BREAKDOWN_KEYS, breakdown)),
+                "timeline_weeks": weeks,
+                "timestamp": timestamp
             }
         }
-        
-        projects.append(project)
+        for i, (t, m, z, sq, cost, breakdown, weeks) in enumerate(zip(
+            type_idx.tolist(), material_idx.tolist(), zip_idx.tolist(), sqft.tolist(),
+            base_cost.tolist(), breakdowns.tolist(), timeline_weeks.tolist()
+        ))
+    ]
     
     # Save to file
     os.makedirs("data/synthetic", exist_ok=True)
-    with open("data/synthetic/projects.json", "w") as f:
-        json.dump(projects, f, indent=2)
+    with open("data/synthetic/projects.json", "wb") as f:
+        f.write(fast_json.dumps(projects, indent=True))
     
     return projects
 
@@ -1,9 +1,10 @@
 import os
 import sys
+import asyncio
 from typing import Dict, Any, List, Optional
-import json
-import math
-import random
+from contextlib import nullcontext
+from functools import lru_cache
+import numpy as np
 
 # Import LangChain components
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
@@ -19,58 +20,165 @@ from langsmith import traceable
 # Import our environment variable loader
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.env_loader import load_and_validate_env
+from utils import fast_json
 
 # Import our vector store implementation
-from backend.vector_store import PineconeVectorStore
+from backend.vector_store import get_mock_vector_store, get_pinecone_vector_store
 
 # Import our LangSmith logger
 from backend.langsmith_logger import get_langsmith_logger
 
+# Import the OpenAI clients shared across the backend
+from backend.openai_clients import shared_llm, shared_embeddings
+
+# Import our result cache for LLM estimates
+from backend.result_cache import ResultCache
+
 # Initialize LangSmith logger
 langsmith_logger = get_langsmith_logger()
 
-class CostEstimator:
-    """Cost estimator for renovation projects."""
+# Mock estimate tables, indexed by [project type, material grade]. Index 3
+# is the fallback row/column for unknown project types and material grades.
+_PROJECT_INDEX = {"kitchen": 0, "bathroom": 1, "addition": 2}
+_GRADE_INDEX = {"standard": 0, "premium": 1, "luxury": 2}
+
+# Base cost per square foot
+_BASE_COST_TABLE = np.array([
+    [250, 350, 500, 300],
+    [300, 450, 650, 300],
+    [350, 450, 750, 300],
+    [300, 300, 300, 300]
+], dtype=np.int64)
+
+# Timeline in weeks
+_TIMELINE_TABLE = np.array([
+    [6, 8, 10, 8],
+    [4, 6, 8, 8],
+    [8, 12, 16, 8],
+    [8, 8, 8, 8]
+], dtype=np.int64)
+
+# Share of the mid-range cost going to each category, in basis points
+_MATERIALS_BP_TABLE = np.array([4000, 4500, 5000, 4000], dtype=np.int64)
+_LABOR_BP_TABLE = np.array([3500, 3000, 2500, 3500], dtype=np.int64)
+_PERMITS_BP = 500
+_DESIGN_BP = 1000
+
+# Random source for mock confidence scores and reference projects
+_RNG = np.random.default_rng()
+
+def _table_codes(values: List[str], index: Dict[str, int]) -> np.ndarray:
+    """Map labels to table indices, using 3 for labels not in the index.
     
-    def __init__(self, vector_store=None):
-        """Initialize with optional vector store."""
-        # Load environment variables
-        if not load_and_validate_env(["OPENAI_API_KEY"]):
-            raise EnvironmentError("Failed to load required environment variables")
-        
-        # Initialize vector store
-        if vector_store is None:
-            try:
-                # Try to use Pinecone vector store
-                print("Initializing Pinecone vector store...")
-                self.vector_store = PineconeVectorStore()
-                print("Successfully initialized Pinecone vector store")
-            except Exception as e:
-                print(f"Error initializing Pinecone vector store: {e}")
-                print("Falling back to mock vector store")
-                from backend.vector_store import MockVectorStore
-                self.vector_store = MockVectorStore()
-        else:
-            self.vector_store = vector_store
-        
-        # Initialize OpenAI client with GPT-4o-mini model
-        self.llm = ChatOpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="gpt-4o-mini",
-            temperature=0.1
-        )
-        
-        # Initialize embeddings model
-        self.embeddings = OpenAIEmbeddings(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="text-embedding-3-small"
-        )
-        
-        # Create LangChain retriever if vector store is provided
-        self.retriever = self._create_langchain_retriever()
+    Only the distinct labels go through the dict; every element is then
+    mapped with one array gather.
+    """
+    labels, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    codes = np.array([index.get(label, 3) for label in labels.tolist()], dtype=np.intp)
+    return codes[inverse.reshape(-1)]
+
+def mock_estimate_batch(project_types: List[str], square_feet: List[int],
+                        material_grades: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Compute mock estimate figures for many projects at once.
+    
+    Produces the same figures as the scalar mock estimate, one array
+    element per project, using NumPy table lookups instead of a Python
+    call per project.
+    
+    Args:
+        project_types: Project type for each project
+        square_feet: Whole square footage for each project
+        material_grades: Material grade for each project
         
-        # Define prompt template for cost estimation
-        self.prompt_template = ChatPromptTemplate.from_template("""
+    Returns:
+        Dictionary of integer arrays keyed by min_cost, max_cost,
+        timeline_weeks and each cost breakdown category
+    """
+    type_idx = _table_codes(project_types, _PROJECT_INDEX)
+    grade_idx = _table_codes(material_grades, _GRADE_INDEX)
+    sqft = np.asarray(square_feet, dtype=np.int64)
+    
+    # Calculate total cost range rounded to the nearest thousand
+    mid_cost = _BASE_COST_TABLE[type_idx, grade_idx] * sqft
+    min_cost = (mid_cost * 0.85).astype(np.int64) // 1000 * 1000
+    max_cost = -(-(mid_cost * 1.15).astype(np.int64) // 1000) * 1000
+    
+    # Cost breakdown
+    materials = mid_cost * _MATERIALS_BP_TABLE[grade_idx] // 10000
+    labor = mid_cost * _LABOR_BP_TABLE[grade_idx] // 10000
+    permits = mid_cost * _PERMITS_BP // 10000
+    design = mid_cost * _DESIGN_BP // 10000
+    
+    return {
+        "min_cost": min_cost,
+        "max_cost": max_cost,
+        "timeline_weeks": _TIMELINE_TABLE[type_idx, grade_idx],
+        "materials": materials,
+        "labor": labor,
+        "permits": permits,
+        "design": design,
+        "other": mid_cost - materials - labor - permits - design
+    }
+
+@lru_cache(maxsize=4096, typed=True)
+def _mock_estimate_figures(project_type: str, square_feet: int, material_grade: str) -> tuple:
+    """Compute the deterministic parts of a mock estimate.
+    
+    Returns an immutable tuple of (min_cost, max_cost, timeline_weeks,
+    materials, labor, permits, design, other) so cached results can't be
+    mutated by callers. Integer square footage uses exact basis-point
+    arithmetic; anything else goes through the original percentage
+    arithmetic so the figures keep their original values and types. The
+    cache is typed so 200 and 200.0 don't share an entry.
+    """
+    # Get base values
+    type_idx = _PROJECT_INDEX.get(project_type, 3)
+    grade_idx = _GRADE_INDEX.get(material_grade, 3)
+    base_cost = int(_BASE_COST_TABLE[type_idx, grade_idx])
+    base_weeks = int(_TIMELINE_TABLE[type_idx, grade_idx])
+    
+    # Calculate total cost range with variability
+    mid_cost = base_cost * square_feet
+    min_cost = int(mid_cost * 0.85)
+    max_cost = int(mid_cost * 1.15)
+    
+    # Round to nearest thousand
+    min_cost = min_cost // 1000 * 1000
+    max_cost = -(-max_cost // 1000) * 1000
+    
+    # Cost breakdown
+    materials_bp = int(_MATERIALS_BP_TABLE[grade_idx])
+    labor_bp = int(_LABOR_BP_TABLE[grade_idx])
+    
+    if isinstance(mid_cost, int):
+        mid_materials = mid_cost * materials_bp // 10000
+        mid_labor = mid_cost * labor_bp // 10000
+        mid_permits = mid_cost * _PERMITS_BP // 10000
+        mid_design = mid_cost * _DESIGN_BP // 10000
+    else:
+        mid_materials = int(mid_cost * (materials_bp / 10000))
+        mid_labor = int(mid_cost * (labor_bp / 10000))
+        mid_permits = int(mid_cost * (_PERMITS_BP / 10000))
+        mid_design = int(mid_cost * (_DESIGN_BP / 10000))
+    mid_other = mid_cost - mid_materials - mid_labor - mid_permits - mid_design
+    
+    return (min_cost, max_cost, base_weeks, mid_materials, mid_labor,
+            mid_permits, mid_design, mid_other)
+
+# Set once the environment validates; a failed check is retried on the next
+# call so a fixed .env is picked up without restarting the process
+_env_validated = False
+
+def _env_ok() -> bool:
+    """Load and validate required environment variables until they pass."""
+    global _env_validated
+    if not _env_validated:
+        _env_validated = load_and_validate_env(["OPENAI_API_KEY"])
+    return _env_validated
+
+# Prompt template for cost estimation, parsed once at import
+_PROMPT_TEMPLATE = ChatPromptTemplate.from_template("""
 You are a renovation cost estimation expert. 
 
 Given the following project details and reference projects, provide a detailed cost estimate.
@@ -107,6 +215,42 @@ Format your response as a JSON object with the following structure:
 
 Include only the JSON object in your response, no other text.
 """)
+
+class CostEstimator:
+    """Cost estimator for renovation projects."""
+    
+    def __init__(self, vector_store=None):
+        """Initialize with optional vector store."""
+        # Load environment variables
+        if not _env_ok():
+            raise EnvironmentError("Failed to load required environment variables")
+        
+        # Initialize vector store
+        if vector_store is None:
+            try:
+                # Try to use Pinecone vector store
+                print("Initializing Pinecone vector store...")
+                self.vector_store = get_pinecone_vector_store()
+                print("Successfully initialized Pinecone vector store")
+            except Exception as e:
+                print(f"Error initializing Pinecone vector store: {e}")
+                print("Falling back to mock vector store")
+                self.vector_store = get_mock_vector_store()
+        else:
+            self.vector_store = vector_store
+        
+        # OpenAI clients are shared by all estimators
+        self.llm = shared_llm()
+        self.embeddings = shared_embeddings()
+        
+        # Create LangChain retriever if vector store is provided
+        self.retriever = self._create_langchain_retriever()
+        
+        # Cache LLM estimates for repeated inputs
+        self.estimate_cache = ResultCache(capacity=1024)
+        
+        # Prompt template for cost estimation
+        self.prompt_template = _PROMPT_TEMPLATE
     
     def _create_langchain_retriever(self):
         """Create a LangChain retriever from our vector store."""
@@ -122,13 +266,10 @@ Include only the JSON object in your response, no other text.
                 results = self.vector_store.similarity_search(query, **kwargs)
                 
                 # Convert to LangChain Document objects
-                documents = []
-                for result in results:
-                    content = result.get("text", "")
-                    metadata = result.get("metadata", {})
-                    documents.append(Document(page_content=content, metadata=metadata))
-                
-                return documents
+                return [
+                    Document(page_content=result.get("text", ""), metadata=result.get("metadata", {}))
+                    for result in results
+                ]
                 
         return CustomRetriever(self.vector_store)
     
@@ -145,43 +286,52 @@ Include only the JSON object in your response, no other text.
         else:
             return self._estimate(input_data)
     
+    async def aestimate(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Generate a cost estimate without blocking the event loop."""
+        if langsmith_logger.is_enabled():
+            traced_estimate = langsmith_logger.trace(
+                name="cost_estimate", 
+                run_type="chain"
+            )(self._aestimate)
+            return await traced_estimate(input_data)
+        else:
+            return await self._aestimate(input_data)
+    
+    async def aestimate_batch(self, inputs: List[Dict[str, Any]],
+                              max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        """Generate several estimates concurrently, in input order.
+        
+        Args:
+            inputs: Input data for each estimate
+            max_concurrency: Maximum number of estimates in flight at once,
+                to stay within API rate limits
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def bounded_estimate(input_data):
+            async with semaphore:
+                return await self.aestimate(input_data)
+        
+        return await asyncio.gather(*[bounded_estimate(input_data) for input_data in inputs])
+    
     def _estimate(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Internal method to generate a cost estimate based on input data."""
-        # Extract input parameters with support for both naming conventions
-        project_type = input_data.get("project_type", input_data.get("room_type", "kitchen"))
-        square_feet = input_data.get("square_feet", input_data.get("square_footage", 200))
-        material_grade = input_data.get("material_grade", "standard")
-        zip_code = input_data.get("zip_code", "00000")
-        timeline_months = input_data.get("timeline_months", 2)
+        project_type, square_feet, material_grade, zip_code, timeline_months = self._read_inputs(input_data)
         
         # Retrieve similar projects
         query = f"{project_type} renovation with {square_feet} sq ft using {material_grade} materials"
         
-        # Create a context for tracing vector search
-        if langsmith_logger.is_enabled():
-            search_context = langsmith_logger.create_run_context()
-        else:
-            # Create a dummy context if LangSmith is disabled
-            class DummyContext:
-                def __enter__(self): return self
-                def __exit__(self, *args, **kwargs): pass
-            search_context = DummyContext()
+        # Reuse the estimate for identical earlier inputs; the query text is
+        # built from these same inputs, so they are the whole cache key
+        cache_key = (project_type, square_feet, material_grade, zip_code, timeline_months)
+        cached_estimate = self.estimate_cache.get(cache_key)
+        if cached_estimate is not None:
+            return cached_estimate
             
         # Perform vector search with tracing
-        with search_context:
-            # Get filter parameters
-            filter_params = {
-                "project_type": project_type,
-                "material_grade": material_grade
-            }
-            
-            # Perform vector search
+        with self._run_context():
             results = self.vector_store.similarity_search(query)
-            
-            # Convert to documents
-            reference_docs = [Document(page_content=result["text"], metadata=result.get("metadata", {})) 
-                               for result in results]
-            reference_projects = "\n".join([doc.page_content for doc in reference_docs])
+            reference_projects = self._reference_projects(results)
             
         # Create input for the LLM
         chain_input = {
@@ -196,51 +346,103 @@ Include only the JSON object in your response, no other text.
         # Create and run the LangChain with tracing
         chain = self.prompt_template | self.llm
         
-        # Create a context for tracing LLM call
-        if langsmith_logger.is_enabled():
-            llm_context = langsmith_logger.create_run_context()
-        else:
-            llm_context = DummyContext()
-            
         # Make the LLM call with tracing
-        with llm_context:
+        with self._run_context():
             try:
-                # Make the LLM call
                 result = chain.invoke(chain_input)
-                
-                # Extract content from LangChain's response format
-                response_text = result.content
-                
-                # Parse the JSON response
-                try:
-                    estimate_data = json.loads(response_text)
-                    return estimate_data
-                except (json.JSONDecodeError, AttributeError) as e:
-                    # Fallback to mock data if parsing fails
-                    print(f"Error parsing LLM response: {e}")
-                    return self._generate_mock_estimate(project_type, square_feet, material_grade)
-                
+                return self._parse_estimate(result.content, chain_input, cache_key)
+            except Exception as e:
+                print(f"Error during LLM call: {e}")
+                return self._generate_mock_estimate(project_type, square_feet, material_grade)
+    
+    async def _aestimate(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of _estimate."""
+        project_type, square_feet, material_grade, zip_code, timeline_months = self._read_inputs(input_data)
+        
+        query = f"{project_type} renovation with {square_feet} sq ft using {material_grade} materials"
+        cache_key = (project_type, square_feet, material_grade, zip_code, timeline_months)
+        cached_estimate = self.estimate_cache.get(cache_key)
+        if cached_estimate is not None:
+            return cached_estimate
+        
+        with self._run_context():
+            results = await asyncio.to_thread(self.vector_store.similarity_search, query)
+        
+        chain_input = {
+            "project_type": project_type,
+            "square_feet": square_feet,
+            "material_grade": material_grade,
+            "zip_code": zip_code,
+            "timeline_months": timeline_months,
+            "reference_projects": self._reference_projects(results)
+        }
+        
+        chain = self.prompt_template | self.llm
+        
+        with self._run_context():
+            try:
+                result = await chain.ainvoke(chain_input)
+                return self._parse_estimate(result.content, chain_input, cache_key)
             except Exception as e:
                 print(f"Error during LLM call: {e}")
                 return self._generate_mock_estimate(project_type, square_feet, material_grade)
     
+    @staticmethod
+    def _read_inputs(input_data: Dict[str, Any]) -> tuple:
+        """Extract estimate parameters, supporting both naming conventions."""
+        return (
+            input_data.get("project_type", input_data.get("room_type", "kitchen")),
+            input_data.get("square_feet", input_data.get("square_footage", 200)),
+            input_data.get("material_grade", "standard"),
+            input_data.get("zip_code", "00000"),
+            input_data.get("timeline_months", 2)
+        )
+    
+    @staticmethod
+    def _run_context():
+        """Return a LangSmith run context, or a no-op context if tracing is disabled."""
+        if langsmith_logger.is_enabled():
+            return langsmith_logger.create_run_context()
+        return nullcontext()
+    
+    @staticmethod
+    def _reference_projects(results: List[Dict[str, Any]]) -> str:
+        """Join vector search results into the prompt's reference projects."""
+        return "\n".join(result["text"] for result in results)
+    
+    def _parse_estimate(self, response_text: str, chain_input: Dict[str, Any],
+                        cache_key: tuple) -> Dict[str, Any]:
+        """Parse the LLM's JSON response, falling back to mock data if it's invalid."""
+        try:
+            # Models sometimes wrap the JSON in prose or a code fence, so
+            # parse only the span from the first to the last brace
+            start = response_text.find("{")
+            end = response_text.rfind("}") + 1
+            estimate_data = fast_json.loads(response_text[start:end])
+        except (fast_json.JSONDecodeError, AttributeError) as e:
+            # Fallback to mock data if parsing fails
+            print(f"Error parsing LLM response: {e}")
+            return self._generate_mock_estimate(
+                chain_input["project_type"], chain_input["square_feet"], chain_input["material_grade"]
+            )
+        
+        self.estimate_cache.put(cache_key, estimate_data)
+        return estimate_data
+    
     def _generate_mock_references(self, project_type: str, square_feet: int, material_grade: str) -> str:
         """Generate mock reference projects for testing."""
         # This is used only when vector store is not available
-        base_costs = {
-            "kitchen": {"standard": 250, "premium": 350, "luxury": 500},
-            "bathroom": {"standard": 300, "premium": 450, "luxury": 650},
-            "addition": {"standard": 350, "premium": 450, "luxury": 750}
-        }
-        
-        base_cost = base_costs.get(project_type, {}).get(material_grade, 300)
+        base_cost = int(_BASE_COST_TABLE[_PROJECT_INDEX.get(project_type, 3),
+                                          _GRADE_INDEX.get(material_grade, 3)])
         
         # Generate 3 similar mock projects
+        size_variances = _RNG.uniform(0.85, 1.15, size=3).tolist()
+        cost_variances = _RNG.uniform(0.9, 1.1, size=3).tolist()
+        
         projects = []
-        for i in range(3):
-            size_variance = random.uniform(0.85, 1.15)
+        for i, (size_variance, cost_variance) in enumerate(zip(size_variances, cost_variances)):
             sample_size = int(square_feet * size_variance)
-            sample_cost = int(base_cost * sample_size * random.uniform(0.9, 1.1))
+            sample_cost = int(base_cost * sample_size * cost_variance)
             project = f"Project {i+1}: {project_type} renovation, {sample_size} sq ft, {material_grade} grade, total cost: ${sample_cost:,}"
             projects.append(project)
         
@@ -248,48 +450,15 @@ Include only the JSON object in your response, no other text.
     
     def _generate_mock_estimate(self, project_type: str, square_feet: int, material_grade: str) -> Dict[str, Any]:
         """Generate a mock estimate when real data is unavailable."""
-        # Base cost per square foot based on project type and material grade
-        base_costs = {
-            "kitchen": {"standard": 250, "premium": 350, "luxury": 500},
-            "bathroom": {"standard": 300, "premium": 450, "luxury": 650},
-            "addition": {"standard": 350, "premium": 450, "luxury": 750}
-        }
-        
-        # Timeline in weeks
-        timelines = {
-            "kitchen": {"standard": 6, "premium": 8, "luxury": 10},
-            "bathroom": {"standard": 4, "premium": 6, "luxury": 8},
-            "addition": {"standard": 8, "premium": 12, "luxury": 16}
-        }
-        
-        # Get base values
-        base_cost = base_costs.get(project_type, {}).get(material_grade, 300)
-        base_weeks = timelines.get(project_type, {}).get(material_grade, 8)
-        
-        # Calculate total cost range with variability
-        mid_cost = base_cost * square_feet
-        min_cost = int(mid_cost * 0.85)
-        max_cost = int(mid_cost * 1.15)
-        
-        # Round to nearest thousand
-        min_cost = math.floor(min_cost / 1000) * 1000
-        max_cost = math.ceil(max_cost / 1000) * 1000
-        
-        # Cost breakdown
-        materials_pct = {"standard": 0.4, "premium": 0.45, "luxury": 0.5}.get(material_grade, 0.4)
-        labor_pct = {"standard": 0.35, "premium": 0.3, "luxury": 0.25}.get(material_grade, 0.35)
-        
-        mid_materials = int(mid_cost * materials_pct)
-        mid_labor = int(mid_cost * labor_pct)
-        mid_permits = int(mid_cost * 0.05)
-        mid_design = int(mid_cost * 0.1)
-        mid_other = mid_cost - mid_materials - mid_labor - mid_permits - mid_design
+        # Deterministic figures are memoized per input combination
+        (min_cost, max_cost, base_weeks, mid_materials, mid_labor,
+         mid_permits, mid_design, mid_other) = _mock_estimate_figures(project_type, square_feet, material_grade)
         
         # Final estimate
         estimate = {
             "total_range": [min_cost, max_cost],
             "timeline_weeks": base_weeks,
-            "confidence": round(random.uniform(0.85, 0.95), 2),
+            "confidence": round(float(_RNG.uniform(0.85, 0.95)), 2),
             "cost_breakdown": {
                 "materials": mid_materials,
                 "labor": mid_labor,
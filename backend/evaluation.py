@@ -1,18 +1,29 @@
-import json
+import asyncio
+import atexit
+import hashlib
+import math
 import os
-import random
+import re
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Any, Optional
-import pandas as pd
+import numpy as np
 import warnings
 
 # Suppress LangChain deprecation warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="langchain")
 warnings.filterwarnings("ignore", message=".*pydantic_v1.*")
 
-# RAGAS for evaluation
-from ragas.metrics import faithfulness, answer_relevancy, context_precision, context_recall
-from ragas import evaluate
+from utils import fast_json
+
+# Exact-key cache for repeated evaluations
+from backend.result_cache import ResultCache
+from backend.rate_limiter import TokenBucket
+from backend.openai_clients import shared_http_client, shared_embeddings
 
 # LangChain and LangSmith integration
 from langchain.chains import RetrievalQA
@@ -24,28 +35,78 @@ from langchain.schema import Document
 try:
     from langsmith import Client, traceable
     langsmith_available = True
-    # Initialize LangSmith client if API key is available
-    LANGSMITH_API_KEY = os.environ.get("LANGSMITH_API_KEY")
-    if LANGSMITH_API_KEY:
-        langsmith_client = Client(api_key=LANGSMITH_API_KEY)
-    else:
-        langsmith_client = None
 except ImportError:
     langsmith_available = False
-    langsmith_client = None
 
-# Try to import newer RAGAS components
-try:
-    from ragas.metrics import (
-        faithfulness as new_faithfulness,
-        answer_relevancy as new_answer_relevancy,
-        context_precision as new_context_precision,
-        context_recall as new_context_recall
+@lru_cache(maxsize=1)
+def _langsmith_client():
+    """Return the shared LangSmith client, created on first use.
+    
+    Returns None if LangSmith isn't installed or no API key is set. The
+    key is read on first use rather than at import, since the environment
+    may be loaded after this module is imported.
+    """
+    api_key = os.environ.get("LANGSMITH_API_KEY")
+    if not langsmith_available or not api_key:
+        return None
+    return Client(api_key=api_key)
+
+# Evidence is written by a single background thread so disk latency stays out
+# of the request path. One worker keeps writes in submission order, and
+# pending writes are flushed when the interpreter exits.
+_EVAL_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eval-writer")
+atexit.register(_EVAL_WRITER.shutdown, wait=True)
+
+def _submit_write(path, payload, mode="wb"):
+    """Queue a write on the evidence writer, reporting any failure it raises."""
+    _EVAL_WRITER.submit(_write_file, path, payload, mode).add_done_callback(_report_write_error)
+
+def _report_write_error(future):
+    """Print the exception of a failed background write, if any."""
+    error = future.exception()
+    if error is not None:
+        print(f"Warning: Background evaluation write failed: {error!r}")
+
+# Evaluations are appended to one rolling log, one JSON object per line
+_EVAL_LOG_PATH = "data/evaluation/evals.jsonl"
+
+def _log_evaluations(*evaluations):
+    """Queue evaluations to be appended to the evaluation log.
+    
+    Serializing on the caller's thread means callers may modify the
+    evaluations as soon as this returns.
+    """
+    payload = b"".join(
+        fast_json.dumps(evaluation, append_newline=True)
+        for evaluation in evaluations
     )
-    from datasets import Dataset
-    NEWER_RAGAS_AVAILABLE = True
-except ImportError:
-    NEWER_RAGAS_AVAILABLE = False
+    _submit_write(_EVAL_LOG_PATH, payload, "ab")
+
+def _save_json(path, data):
+    """Serialize data as indented JSON and queue it to be written to a file."""
+    payload = fast_json.dumps(data, indent=True)
+    _submit_write(path, payload)
+
+def _write_file(path, payload, mode="wb"):
+    """Write bytes to a file, reporting rather than raising on failure.
+    
+    The parent directory is only created when the first attempt finds it
+    missing, so the common case costs no extra syscalls.
+    """
+    try:
+        try:
+            f = open(path, mode)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            f = open(path, mode)
+        with f:
+            f.write(payload)
+    except OSError as e:
+        print(f"Warning: Could not save {path}: {e}")
+
+def _now_iso():
+    """Return the current time as an ISO string, to the microsecond."""
+    return datetime.now().isoformat()
 
 # Define the decorator function based on langsmith availability
 def evaluation_decorator(func):
@@ -54,10 +115,358 @@ def evaluation_decorator(func):
     else:
         return func
 
+# RAGAS metric names, in the order every evaluation reports them
+_RAGAS_METRIC_NAMES = ("faithfulness", "answer_relevancy", "context_precision", "context_recall")
+
+# Metrics judged with and without contexts (context-based metrics need
+# contexts), with each prompt's list of names joined once at import rather
+# than on every call
+_JUDGE_METRICS_WITH_CONTEXTS = _RAGAS_METRIC_NAMES
+_JUDGE_METRICS_WITHOUT_CONTEXTS = _RAGAS_METRIC_NAMES[:2]
+_JUDGE_METRIC_LISTS = MappingProxyType({
+    metric_names: ", ".join(metric_names)
+    for metric_names in (_JUDGE_METRICS_WITH_CONTEXTS, _JUDGE_METRICS_WITHOUT_CONTEXTS)
+})
+
+# Single-call LLM judge that scores all RAGAS metrics at once, where the stock
+# RAGAS metrics make one or two judge calls each
+CONSOLIDATED_JUDGE_PROMPT = ChatPromptTemplate.from_template("""
+You are evaluating a retrieval-augmented answer. Score each metric from 0.0 to 1.0:
+
+- faithfulness: the answer's claims are supported by the contexts
+- answer_relevancy: the answer directly addresses the question
+- context_precision: the contexts are relevant to the question
+- context_recall: the contexts contain the information the answer needs
+
+Question:
+{question}
+
+Answer:
+{answer}
+
+Contexts:
+{contexts}
+
+Score only these metrics: {metric_names}
+
+Respond with a JSON object mapping each metric name to its score, no other text.
+""")
+
+# Fallback for judge responses that aren't clean JSON
+_JUDGE_SCORE_RE = re.compile(
+    r'"?(' + "|".join(_RAGAS_METRIC_NAMES) + r')"?\s*:\s*([01](?:\.\d+)?)'
+)
+
+def _judge_available():
+    """Return whether judge calls can succeed at all.
+    
+    Without an OpenAI API key every embedding and judge call fails only
+    after a network round-trip, so callers go straight to simulation.
+    The environment is checked per call because it may be loaded after
+    this module is imported.
+    """
+    return bool(os.environ.get("OPENAI_API_KEY"))
+
+# Judge call limits. A judge response is a few dozen tokens and usually
+# arrives within a few seconds, so a call still pending after 30 seconds is
+# abandoned; failed calls are retried up to 5 times with the OpenAI client's
+# exponential backoff. At most 8 judge calls from one batch are in flight at
+# once, which keeps bursts well inside the default request quota below.
+_JUDGE_TIMEOUT = 30
+_JUDGE_MAX_RETRIES = 5
+_JUDGE_CONCURRENCY = 8
+
+@lru_cache(maxsize=1)
+def _judge_llm():
+    """Return the judge model shared by all evaluations, created on first use.
+    
+    It sends requests through the backend's shared connection pool.
+    """
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0,
+        max_retries=_JUDGE_MAX_RETRIES,
+        timeout=_JUDGE_TIMEOUT,
+        http_client=shared_http_client()
+    )
+
+@lru_cache(maxsize=1)
+def _judge_chain():
+    """Return the judge prompt piped into the shared judge model, built once."""
+    return CONSOLIDATED_JUDGE_PROMPT | _judge_llm()
+
+# Judge calls share the account's per-minute quota, set with OPENAI_RPM and
+# OPENAI_TPM (defaults are the lowest paid tier for gpt-4o-mini)
+_DEFAULT_RPM = 500.0
+_DEFAULT_TPM = 200000.0
+
+def _judge_buckets():
+    """Return the (request, token) rate limiter buckets for judge calls.
+    
+    The quota is read from the environment per call, like the API key in
+    _judge_available, because it may be loaded after this module is
+    imported. Callers with the same quota share the same buckets.
+    """
+    return _quota_buckets(
+        _read_quota("OPENAI_RPM", _DEFAULT_RPM),
+        _read_quota("OPENAI_TPM", _DEFAULT_TPM)
+    )
+
+def _read_quota(name, default):
+    """Read a per-minute quota from the environment, or the default if invalid.
+    
+    A zero, negative or non-finite quota would make the buckets raise or
+    wait forever, so anything but a positive number falls back to the
+    default with a warning.
+    """
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        quota = float(value)
+    except ValueError:
+        quota = float("nan")
+    if not (math.isfinite(quota) and quota > 0):
+        _warn_invalid_quota(name, value, default)
+        return default
+    return quota
+
+@lru_cache(maxsize=16)
+def _warn_invalid_quota(name, value, default):
+    """Print a warning for an invalid quota setting, once per distinct value."""
+    print(f"Warning: Ignoring invalid {name}={value!r}; using the default of {default:g}")
+
+@lru_cache(maxsize=4)
+def _quota_buckets(rpm, tpm):
+    """Build request and token buckets, each allowing a burst of ten seconds' worth of quota."""
+    return (
+        TokenBucket(rate_per_sec=rpm / 60, burst=rpm / 6),
+        TokenBucket(rate_per_sec=tpm / 60, burst=tpm / 6)
+    )
+
+# Output tokens budgeted per judge call; the response is a small JSON object
+_JUDGE_MAX_OUTPUT_TOKENS = 64
+
+@lru_cache(maxsize=1)
+def _judge_encoding():
+    """Return the judge model's tokenizer, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-4o-mini")
+    except Exception:
+        return None
+
+def _judge_token_cost(prompt_inputs):
+    """Estimate the quota tokens one judge call consumes."""
+    prompt_text = CONSOLIDATED_JUDGE_PROMPT.format(**prompt_inputs)
+    encoding = _judge_encoding()
+    # Roughly four characters per token when the tokenizer is unavailable
+    prompt_tokens = len(encoding.encode(prompt_text)) if encoding else len(prompt_text) // 4
+    return prompt_tokens + _JUDGE_MAX_OUTPUT_TOKENS
+
+def _wait_for_judge_quota(prompt_inputs):
+    """Block until the rate limiter admits a judge call."""
+    request_bucket, token_bucket = _judge_buckets()
+    request_bucket.wait()
+    token_bucket.wait(_judge_token_cost(prompt_inputs))
+
+async def _await_judge_quota(prompt_inputs):
+    """Wait, without blocking the event loop, until a judge call is admitted."""
+    request_bucket, token_bucket = _judge_buckets()
+    await request_bucket.acquire()
+    await token_bucket.acquire(_judge_token_cost(prompt_inputs))
+
+# Judged metrics keyed by (question, answer digest, contexts)
+_EVAL_CACHE = ResultCache(capacity=1024)
+
+def _parse_judge_scores(response_text: str, metric_names) -> Dict[str, float]:
+    """Extract metric scores from the judge's response.
+    
+    Raises:
+        ValueError: If any requested metric is missing from the response
+    """
+    try:
+        start = response_text.find("{")
+        end = response_text.rfind("}") + 1
+        scores = fast_json.loads(response_text[start:end])
+    except fast_json.JSONDecodeError:
+        scores = {match.group(1): match.group(2) for match in _JUDGE_SCORE_RE.finditer(response_text)}
+    
+    missing = [name for name in metric_names if name not in scores]
+    if missing:
+        raise ValueError(f"Judge response is missing metrics: {missing}")
+    return {name: float(scores[name]) for name in metric_names}
+
+def _judge_metric_names(contexts):
+    """Return the metrics to judge, one of the precomputed name tuples."""
+    return _JUDGE_METRICS_WITH_CONTEXTS if contexts else _JUDGE_METRICS_WITHOUT_CONTEXTS
+
+def _judge_prompt_inputs(question, answer, contexts, metric_names):
+    """Return the template variables for CONSOLIDATED_JUDGE_PROMPT."""
+    return {
+        "question": question,
+        "answer": answer,
+        "contexts": "\n\n".join(contexts) if contexts else "(none)",
+        "metric_names": _JUDGE_METRIC_LISTS[metric_names]
+    }
+
+def _judged_evaluation(question, answer, contexts, metric_names, response_text):
+    """Build and save the evaluation record for a judge response."""
+    evaluation = {
+        "question": question,
+        "answer": answer,
+        "contexts": contexts if contexts else [],
+        "metrics": _parse_judge_scores(response_text, metric_names),
+        "timestamp": _now_iso()
+    }
+    
+    # Save evaluation for evidence
+    _log_evaluations(evaluation)
+    
+    return evaluation
+
+def evaluate_with_judge(question: str, answer: str, contexts: List[str] = None) -> Dict[str, Any]:
+    """Evaluate using one consolidated LLM judge call."""
+    metric_names = _judge_metric_names(contexts)
+    
+    prompt_inputs = _judge_prompt_inputs(question, answer, contexts, metric_names)
+    _wait_for_judge_quota(prompt_inputs)
+    
+    result = _judge_chain().invoke(prompt_inputs)
+    return _judged_evaluation(question, answer, contexts, metric_names, result.content)
+
+async def aevaluate_with_judge(question: str, answer: str, contexts: List[str] = None) -> Dict[str, Any]:
+    """Async counterpart of evaluate_with_judge."""
+    metric_names = _judge_metric_names(contexts)
+    
+    prompt_inputs = _judge_prompt_inputs(question, answer, contexts, metric_names)
+    await _await_judge_quota(prompt_inputs)
+    
+    result = await _judge_chain().ainvoke(prompt_inputs)
+    return _judged_evaluation(question, answer, contexts, metric_names, result.content)
+
+async def abatch_evaluate(pairs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Judge several question-answer pairs concurrently.
+    
+    At most _JUDGE_CONCURRENCY judge calls run at once. Suited to small
+    interactive batches; use batch_evaluate for bulk offline evidence
+    generation.
+    
+    Args:
+        pairs (list): Dicts with "question", "answer" and optional "contexts"
+        
+    Returns:
+        list: Evaluations in input order, simulated where judging failed
+    """
+    if not _judge_available():
+        return simulate_ragas_evaluation_batch(
+            [pair["question"] for pair in pairs],
+            [pair["answer"] for pair in pairs],
+            [pair.get("contexts") for pair in pairs]
+        )
+    
+    # Bound the calls in flight so a large batch doesn't open a connection
+    # per pair at once
+    semaphore = asyncio.Semaphore(_JUDGE_CONCURRENCY)
+    
+    async def judge(pair):
+        async with semaphore:
+            return await aevaluate_with_judge(pair["question"], pair["answer"], pair.get("contexts"))
+    
+    results = await asyncio.gather(*[judge(pair) for pair in pairs], return_exceptions=True)
+    
+    evaluations = []
+    for pair, result in zip(pairs, results):
+        if isinstance(result, Exception):
+            print(f"Error running LLM judge evaluation: {result}")
+            result = simulate_ragas_evaluation(pair["question"], pair["answer"], pair.get("contexts"))
+        evaluations.append(result)
+    return evaluations
+
+def batch_evaluate(pairs: List[Dict[str, Any]], poll_interval: float = 30.0) -> List[Dict[str, Any]]:
+    """Judge question-answer pairs through the OpenAI Batch API.
+    
+    Batch requests cost half as much as synchronous ones but may take up
+    to 24 hours, so this is meant for offline evidence generation. The
+    call blocks until the batch finishes.
+    
+    Args:
+        pairs (list): Dicts with "question", "answer" and optional "contexts"
+        poll_interval (float): Seconds between batch status checks
+        
+    Returns:
+        list: Evaluations in input order, simulated where judging failed
+        
+    Raises:
+        RuntimeError: If the batch fails, expires or is cancelled
+    """
+    from openai import OpenAI
+    
+    client = OpenAI()
+    
+    # One chat completion request per pair, matched back up by custom_id
+    metric_names = [_judge_metric_names(pair.get("contexts")) for pair in pairs]
+    requests = [
+        fast_json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": "gpt-4o-mini",
+                "temperature": 0,
+                "messages": [{
+                    "role": "user",
+                    "content": CONSOLIDATED_JUDGE_PROMPT.format_messages(**_judge_prompt_inputs(
+                        pair["question"], pair["answer"], pair.get("contexts"), metric_names[i]
+                    ))[0].content
+                }]
+            }
+        })
+        for i, pair in enumerate(pairs)
+    ]
+    
+    batch_file = client.files.create(file=("judge_batch.jsonl", b"\n".join(requests)), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    
+    while batch.status in ("validating", "in_progress", "finalizing"):
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Judge batch {batch.id} ended with status {batch.status}")
+    
+    # Collect the response text for each request that succeeded
+    responses = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = fast_json.loads(line)
+        body = (record.get("response") or {}).get("body") or {}
+        if body.get("choices"):
+            responses[record["custom_id"]] = body["choices"][0]["message"]["content"]
+    
+    evaluations = []
+    for i, pair in enumerate(pairs):
+        try:
+            evaluations.append(_judged_evaluation(
+                pair["question"], pair["answer"], pair.get("contexts"), metric_names[i], responses[str(i)]
+            ))
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"Error judging batch item {i}: {e}")
+            evaluations.append(simulate_ragas_evaluation(pair["question"], pair["answer"], pair.get("contexts")))
+    return evaluations
+
 @evaluation_decorator
 def evaluate_with_ragas(question: str, answer: str, contexts: List[str] = None) -> Dict[str, Any]:
     """Evaluate answer quality using RAGAS metrics.
     
+    Scores come from a single consolidated LLM judge call, falling back to
+    simulated metrics if the judge is unavailable.
+    
     Args:
         question (str): The user query or question
         answer (str): The generated answer to evaluate
@@ -66,150 +475,172 @@ def evaluate_with_ragas(question: str, answer: str, contexts: List[str] = None)
     Returns:
         dict: Dictionary containing evaluation metrics
     """
+    if not _judge_available():
+        return simulate_ragas_evaluation(question, answer, contexts)
+    
+    # Reuse the metrics of an earlier evaluation of the same question,
+    # answer and contexts. The answer is keyed by a digest of its full text
+    # so long answers don't bloat the key.
+    answer_digest = hashlib.blake2b(answer.encode(), digest_size=16).hexdigest()
+    cache_key = (question, answer_digest, tuple(contexts) if contexts else ())
+    cached_metrics = _EVAL_CACHE.get(cache_key)
+    if cached_metrics is not None:
+        return {
+            "question": question,
+            "answer": answer,
+            "contexts": contexts if contexts else [],
+            "metrics": cached_metrics,
+            "timestamp": _now_iso()
+        }
+    
     try:
-        # Check if we can use the newer RAGAS API
-        if NEWER_RAGAS_AVAILABLE:
-            try:
-                return evaluate_with_newer_ragas(question, answer, contexts)
-            except Exception as e:
-                print(f"Error with newer RAGAS API: {e}")
-                # Try older API as fallback
-                try:
-                    return evaluate_with_older_ragas(question, answer, contexts)
-                except Exception as e:
-                    print(f"Error with older RAGAS API: {e}")
-                    # Fall back to simulated metrics
-                    return simulate_ragas_evaluation(question, answer, contexts)
-        else:
-            try:
-                return evaluate_with_older_ragas(question, answer, contexts)
-            except Exception as e:
-                print(f"Error with older RAGAS API: {e}")
-                # Fall back to simulated metrics
-                return simulate_ragas_evaluation(question, answer, contexts)
+        evaluation = evaluate_with_judge(question, answer, contexts)
     except Exception as e:
-        print(f"Error running RAGAS evaluation: {e}")
+        print(f"Error running LLM judge evaluation: {e}")
         # Fall back to simulated metrics
         return simulate_ragas_evaluation(question, answer, contexts)
-
-def evaluate_with_newer_ragas(question: str, answer: str, contexts: List[str] = None) -> Dict[str, Any]:
-    """Evaluate using the newer RAGAS API."""
-    print("Using newer RAGAS API")
     
-    # Prepare data for newer RAGAS API
-    data = {
-        "question": [question],
-        "answer": [answer],
-    }
-    
-    # Add contexts if provided
-    if contexts:
-        # In newer RAGAS, contexts should be a list of lists of strings
-        data["contexts"] = [contexts]
+    _EVAL_CACHE.put(cache_key, evaluation["metrics"])
+    return evaluation
+
+async def aevaluate_with_ragas(question: str, answer: str, contexts: List[str] = None) -> Dict[str, Any]:
+    """Evaluate answer quality without blocking the caller's event loop.
     
-    # Create a Dataset for RAGAS
-    eval_dataset = Dataset.from_dict(data)
+    The judge call and evidence serialization are blocking, so the
+    evaluation runs in a worker thread rather than on the caller's loop.
     
-    # Select metrics to evaluate
-    metrics = [
-        new_faithfulness,
-        new_answer_relevancy
-    ]
+    Args:
+        question (str): The user query or question
+        answer (str): The generated answer to evaluate
+        contexts (list, optional): Retrieved contexts used for the answer
+        
+    Returns:
+        dict: Dictionary containing evaluation metrics
+    """
+    return await asyncio.to_thread(evaluate_with_ragas, question, answer, contexts)
+
+@lru_cache(maxsize=1)
+def _ragas_validation_setup():
+    """Import RAGAS and build what every validation reuses, on first use.
     
-    # Add context-based metrics if contexts are provided
-    if contexts:
-        metrics.extend([
-            new_context_precision,
-            new_context_recall
-        ])
+    Returns:
+        tuple: (Dataset class, ragas.evaluate, RunConfig, metric lists
+        keyed by whether contexts are given)
     
-    # Run evaluation
-    result = evaluate(
-        eval_dataset,
-        metrics=metrics
-    )
+    Raises:
+        ImportError: If ragas or datasets is not installed
+    """
+    try:
+        from datasets import Dataset
+        from ragas import RunConfig, evaluate
+        from ragas.metrics import faithfulness, answer_relevancy, context_precision, context_recall
+    except ImportError as e:
+        raise ImportError("RAGAS validation needs ragas and datasets: pip install ragas datasets") from e
+    
+    # Run the metric jobs under the judge's limits
+    run_config = RunConfig(timeout=_JUDGE_TIMEOUT, max_retries=_JUDGE_MAX_RETRIES, max_workers=_JUDGE_CONCURRENCY)
+    
+    # Context-based metrics need contexts
+    metrics_by_contexts = MappingProxyType({
+        False: (faithfulness, answer_relevancy),
+        True: (faithfulness, answer_relevancy, context_precision, context_recall)
+    })
+    return Dataset, evaluate, run_config, metrics_by_contexts
+
+def validate_with_ragas(question: str, answer: str, contexts: List[str] = None,
+                        ground_truth: Optional[str] = None) -> Dict[str, Any]:
+    """Score an answer with the stock RAGAS metrics, for offline validation.
     
-    # Extract metrics as dictionary
-    metrics_dict = {}
-    for metric_name, metric_value in result.items():
-        if hasattr(metric_value, 'mean'):
-            metrics_dict[metric_name] = float(metric_value.mean())
-        else:
-            metrics_dict[metric_name] = float(metric_value)
+    This is the multi-call path the consolidated judge replaced, kept so
+    judge scores can be checked against RAGAS (see
+    scripts/run_evaluation.py --ragas-validation). It is never used to
+    serve requests, and RAGAS is only imported when it is called.
     
-    # Create full evaluation object
-    evaluation = {
-        "question": question,
-        "answer": answer,
-        "contexts": contexts if contexts else [],
-        "metrics": metrics_dict,
-        "timestamp": datetime.now().isoformat()
-    }
+    Args:
+        question (str): The user query or question
+        answer (str): The generated answer to evaluate
+        contexts (list, optional): Retrieved contexts used for the answer
+        ground_truth (str, optional): Reference answer for context-based metrics
     
-    # Save evaluation for evidence
-    os.makedirs("data/evaluation", exist_ok=True)
-    with open(f"data/evaluation/eval_{len(os.listdir('data/evaluation'))}.json", "w") as f:
-        json.dump(evaluation, f, indent=2)
+    Returns:
+        dict: Dictionary containing evaluation metrics
     
-    return evaluation
-
-def evaluate_with_older_ragas(question: str, answer: str, contexts: List[str] = None) -> Dict[str, Any]:
-    """Evaluate using the older RAGAS API."""
-    print("Using older RAGAS API")
+    Raises:
+        ImportError: If ragas or datasets is not installed
+    """
+    Dataset, evaluate, run_config, metrics_by_contexts = _ragas_validation_setup()
     
-    # Prepare data for RAGAS
     data = {
         "question": [question],
         "answer": [answer],
     }
-    
-    # Add contexts if provided
     if contexts:
-        data["contexts"] = [[c for c in contexts]]
+        data["contexts"] = [list(contexts)]
+    if ground_truth is not None:
+        data["ground_truth"] = [ground_truth]
     
-    # Create DataFrames for RAGAS
-    eval_df = pd.DataFrame(data)
-    
-    # Select metrics to evaluate
-    metrics = [
-        faithfulness,
-        answer_relevancy
-    ]
-    
-    # Add context-based metrics if contexts are provided
-    if contexts:
-        metrics.extend([
-            context_precision,
-            context_recall
-        ])
-    
-    # Run evaluation
+    # Judge with the same model as the consolidated judge so scores compare,
+    # and embed with the estimator's shared embeddings client
     result = evaluate(
-        eval_df,
-        metrics=metrics
+        Dataset.from_dict(data),
+        metrics=list(metrics_by_contexts[bool(contexts)]),
+        llm=_judge_llm(),
+        embeddings=shared_embeddings(),
+        run_config=run_config
     )
     
-    # Extract metrics as dictionary
-    metrics_dict = {}
-    for metric in result.keys():
-        metrics_dict[metric] = float(result[metric].iloc[0])
-    
-    # Create full evaluation object
     evaluation = {
         "question": question,
         "answer": answer,
         "contexts": contexts if contexts else [],
-        "metrics": metrics_dict,
-        "timestamp": datetime.now().isoformat()
+        "metrics": {name: float(np.mean(value)) for name, value in result.items()},
+        "timestamp": _now_iso(),
+        "ragas_validation": True
     }
     
     # Save evaluation for evidence
-    os.makedirs("data/evaluation", exist_ok=True)
-    with open(f"data/evaluation/eval_{len(os.listdir('data/evaluation'))}.json", "w") as f:
-        json.dump(evaluation, f, indent=2)
+    _log_evaluations(evaluation)
     
     return evaluation
 
+# Simulated RAGAS baselines, one row per project type in _SIMULATED_PROJECT_TYPES
+# and one column per metric in _RAGAS_METRIC_NAMES
+_SIMULATED_PROJECT_TYPES = ("kitchen", "bathroom", "addition", "renovation")
+_SIMULATED_BASELINES = np.array([
+    [0.86, 0.89, 0.79, 0.83],
+    [0.84, 0.87, 0.77, 0.81],
+    [0.82, 0.85, 0.75, 0.79],
+    [0.83, 0.86, 0.76, 0.80]
+])
+
+# Baseline metric rows by project type for the scalar simulation
+_SIMULATED_BASELINES_BY_TYPE = MappingProxyType(dict(zip(_SIMULATED_PROJECT_TYPES, _SIMULATED_BASELINES)))
+
+# Random source for simulated metric jitter
+_RNG = np.random.default_rng()
+
+# Project type keywords, ranked by classification priority as indices into
+# _SIMULATED_PROJECT_TYPES
+_PROJECT_KEYWORD_RE = re.compile(r"kitchen|bathroom|addition|adu", re.IGNORECASE)
+_KEYWORD_RANK = MappingProxyType({"kitchen": 0, "bathroom": 1, "addition": 2, "adu": 2})
+
+@lru_cache(maxsize=4096)
+def _classify_project_type(question):
+    """Classify a question's project type with one regex scan.
+    
+    Keywords are resolved in priority order (kitchen, bathroom, then
+    addition/ADU) regardless of where they appear in the question. The
+    scan stops at the first kitchen match, since nothing outranks it.
+    """
+    best = len(_SIMULATED_PROJECT_TYPES) - 1
+    for match in _PROJECT_KEYWORD_RE.finditer(question):
+        rank = _KEYWORD_RANK[match.group(0).lower()]
+        if rank < best:
+            best = rank
+            if rank == 0:
+                break
+    return _SIMULATED_PROJECT_TYPES[best]
+
 def simulate_ragas_evaluation(question, answer, contexts=None):
     """Simulate RAGAS evaluation when actual evaluation fails.
     
@@ -224,52 +655,18 @@ def simulate_ragas_evaluation(question, answer, contexts=None):
         
     Returns:
         dict: Dictionary containing full evaluation data including question, answer,
-              contexts, metrics, and timestamp
+              contexts, metrics, timestamp, and a "simulated" flag
     """
     # Determine project type from the question
-    question_lower = question.lower()
-    
-    # Pre-calculated metrics based on project type
-    if "kitchen" in question_lower:
-        project_type = "kitchen"
-        metrics = {
-            "faithfulness": 0.86,
-            "answer_relevancy": 0.89,
-            "context_precision": 0.79,
-            "context_recall": 0.83
-        }
-    elif "bathroom" in question_lower:
-        project_type = "bathroom"
-        metrics = {
-            "faithfulness": 0.84,
-            "answer_relevancy": 0.87,
-            "context_precision": 0.77,
-            "context_recall": 0.81
-        }
-    elif "addition" in question_lower or "adu" in question_lower:
-        project_type = "addition"
-        metrics = {
-            "faithfulness": 0.82,
-            "answer_relevancy": 0.85,
-            "context_precision": 0.75,
-            "context_recall": 0.79
-        }
-    else:
-        # Default metrics for any other project type
-        project_type = "renovation"
-        metrics = {
-            "faithfulness": 0.83,
-            "answer_relevancy": 0.86,
-            "context_precision": 0.76,
-            "context_recall": 0.80
-        }
+    project_type = _classify_project_type(question)
     
     print(f"Using simulated RAGAS metrics for {project_type} project")
     
-    # Add slight randomness for demo purposes
-    for key in metrics:
-        metrics[key] += random.uniform(-0.02, 0.02)
-        metrics[key] = min(1.0, max(0.0, metrics[key]))  # Keep in range [0,1]
+    # Pre-calculated metrics based on project type, with slight randomness
+    # for demo purposes, kept in range [0,1]
+    jitter = _RNG.uniform(-0.02, 0.02, size=len(_RAGAS_METRIC_NAMES))
+    scores = np.clip(_SIMULATED_BASELINES_BY_TYPE[project_type] + jitter, 0.0, 1.0)
+    metrics = dict(zip(_RAGAS_METRIC_NAMES, scores.tolist()))
     
     # Create full evaluation object
     evaluation = {
@@ -277,19 +674,71 @@ def simulate_ragas_evaluation(question, answer, contexts=None):
         "answer": answer,
         "contexts": contexts if contexts else [],
         "metrics": metrics,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": _now_iso(),
+        "simulated": True
     }
     
     # Save evaluation for certification evidence
     try:
-        os.makedirs("data/evaluation", exist_ok=True)
-        with open(f"data/evaluation/eval_{len(os.listdir('data/evaluation'))}.json", "w") as f:
-            json.dump(evaluation, f, indent=2)
+        _log_evaluations(evaluation)
     except Exception as e:
         print(f"Warning: Could not save evaluation: {e}")
     
     return evaluation
 
+def simulate_ragas_evaluation_batch(questions, answers, contexts=None):
+    """Simulate RAGAS evaluation for many question-answer pairs at once.
+    
+    Batch counterpart of simulate_ragas_evaluation: project types are
+    classified and metric jitter is drawn for all pairs in single
+    vectorized passes. Only saving the evaluation files is done per pair.
+    
+    Args:
+        questions (list): The user queries or questions
+        answers (list): The generated answers to evaluate, one per question
+        contexts (list, optional): Retrieved contexts for each answer
+        
+    Returns:
+        list: One evaluation dictionary per question, in the same format
+              as simulate_ragas_evaluation
+    """
+    if contexts is None:
+        contexts = [None] * len(questions)
+    
+    # Classify project types with the same precedence as the scalar version
+    questions_lower = np.char.lower(np.asarray(questions, dtype=str))
+    is_kitchen = np.char.find(questions_lower, "kitchen") >= 0
+    is_bathroom = np.char.find(questions_lower, "bathroom") >= 0
+    is_addition = (np.char.find(questions_lower, "addition") >= 0) | (np.char.find(questions_lower, "adu") >= 0)
+    type_idx = np.select([is_kitchen, is_bathroom, is_addition], [0, 1, 2], default=3)
+    
+    # Add slight randomness for demo purposes, keeping scores in [0,1]
+    jitter = _RNG.uniform(-0.02, 0.02, size=(len(questions), len(_RAGAS_METRIC_NAMES)))
+    scores = np.clip(_SIMULATED_BASELINES[type_idx] + jitter, 0.0, 1.0)
+    
+    print(f"Using simulated RAGAS metrics for {len(questions)} questions")
+    
+    timestamp = _now_iso()
+    evaluations = [
+        {
+            "question": question,
+            "answer": answer,
+            "contexts": context if context else [],
+            "metrics": dict(zip(_RAGAS_METRIC_NAMES, row)),
+            "timestamp": timestamp,
+            "simulated": True
+        }
+        for question, answer, context, row in zip(questions, answers, contexts, scores.tolist())
+    ]
+    
+    # Save evaluations for certification evidence
+    try:
+        _log_evaluations(*evaluations)
+    except Exception as e:
+        print(f"Warning: Could not save evaluations: {e}")
+    
+    return evaluations
+
 def generate_model_comparison():
     """Generate comparison between base and fine-tuned models.
     
@@ -298,10 +747,18 @@ def generate_model_comparison():
     This demonstrates the performance improvements from domain-specific
     fine-tuning for certification task evidence.
     
+    The comparison is static, so it is built and saved once per process;
+    each caller receives its own copy.
+    
     Returns:
         dict: Dictionary containing base model metrics, fine-tuned metrics,
               and percentage improvements
     """
+    return copy.deepcopy(_build_model_comparison())
+
+@lru_cache(maxsize=1)
+def _build_model_comparison():
+    """Build the model comparison and save it for evidence."""
     comparison = {
         "base_model": {
             "name": "text-embedding-3-small (standard)",
@@ -330,8 +787,6 @@ def generate_model_comparison():
     }
     
     # Save comparison data
-    os.makedirs("data/evaluation", exist_ok=True)
-    with open("data/evaluation/model_comparison.json", "w") as f:
-        json.dump(comparison, f, indent=2)
+    _save_json("data/evaluation/model_comparison.json", comparison)
     
     return comparison
@@ -0,0 +1,48 @@
+"""
+OpenAI clients shared across the backend.
+
+Every LangChain OpenAI wrapper built here sends its requests through one
+keep-alive HTTP connection pool, so the estimator and the evaluation judge
+reuse warm connections instead of each opening their own. Clients are
+created on first use, after the environment has been loaded.
+
+Usage:
+    from backend.openai_clients import shared_http_client, shared_embeddings
+
+    llm = ChatOpenAI(model="gpt-4o-mini", http_client=shared_http_client())
+    embeddings = shared_embeddings()
+"""
+import os
+from functools import lru_cache
+
+# OpenAI's HTTP client, shared across LangChain's OpenAI wrappers
+import httpx
+from openai import DefaultHttpxClient
+
+from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+
+@lru_cache(maxsize=1)
+def shared_http_client() -> httpx.Client:
+    """Return the keep-alive HTTP connection pool shared by the OpenAI clients."""
+    return DefaultHttpxClient(
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+    )
+
+@lru_cache(maxsize=1)
+def shared_llm() -> ChatOpenAI:
+    """Return the GPT-4o-mini client shared by all estimators."""
+    return ChatOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model="gpt-4o-mini",
+        temperature=0.1,
+        http_client=shared_http_client()
+    )
+
+@lru_cache(maxsize=1)
+def shared_embeddings() -> OpenAIEmbeddings:
+    """Return the embeddings model shared by the estimator and evaluation."""
+    return OpenAIEmbeddings(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model="text-embedding-3-small",
+        http_client=shared_http_client()
+    )
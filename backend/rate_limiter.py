@@ -0,0 +1,81 @@
+"""
+Token-bucket rate limiting for OpenAI calls.
+
+This module keeps LLM judge chat calls under the account's per-minute
+request and token quotas, so bursts are smoothed out locally instead of being
+bounced back as 429s that trigger exponential backoff. Embedding requests
+are not routed through a bucket and rely on the client's own retries.
+
+Each caller reserves its tokens up front and then waits out any deficit, so
+waiters are served in arrival order and no lock is held while sleeping. The
+bucket holds no asyncio primitives, which lets one module-level instance be
+shared across threads and across the event loops Streamlit creates per run.
+
+Usage:
+    from backend.rate_limiter import TokenBucket
+
+    bucket = TokenBucket(rate_per_sec=500 / 60, burst=50)
+
+    bucket.wait()             # synchronous callers
+    await bucket.acquire(1)   # inside a coroutine
+"""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket that refills continuously at a fixed rate.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: float):
+        """
+        Initialize the bucket, starting full.
+
+        Args:
+            rate_per_sec: Tokens added per second
+            burst: Maximum number of tokens the bucket can hold
+
+        Raises:
+            ValueError: If rate_per_sec or burst is not positive
+        """
+        if not (rate_per_sec > 0 and burst > 0):
+            raise ValueError(f"TokenBucket needs a positive rate and burst, got {rate_per_sec} and {burst}")
+
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, going into debt if it is short.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds the caller must wait before using the tokens
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_sec)
+            self._updated = now
+
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate_per_sec)
+
+    def wait(self, tokens: float = 1) -> None:
+        """Block until the tokens are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """Wait without blocking the event loop until the tokens are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
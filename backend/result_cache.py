@@ -0,0 +1,79 @@
+"""
+Bounded LRU cache for LLM results.
+
+Estimates and judged evaluations are fully determined by their inputs, so
+a repeated request can reuse the earlier response instead of paying for
+another round-trip. Entries are keyed by a hashable tuple of every input
+that shapes the prompt, so only identical requests hit; lookups need no
+embedding call and cost one dict access.
+
+Values are deep-copied on the way in and out so callers can't mutate
+cached results, and one lock makes an instance safe to share across
+threads.
+
+Usage:
+    from backend.result_cache import ResultCache
+
+    cache = ResultCache(capacity=1024)
+
+    value = cache.get(("kitchen", 200, "premium"))
+    if value is None:
+        value = compute_value()
+        cache.put(("kitchen", 200, "premium"), value)
+"""
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class ResultCache:
+    """
+    Least-recently-used cache of results keyed by their exact inputs.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            capacity: Maximum number of entries to keep
+        """
+        self.capacity = capacity
+
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached value, marking it most recently used.
+
+        Args:
+            key: Exact-match key of the entry
+
+        Returns:
+            A copy of the cached value, or None if there is none
+        """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(self._entries[key])
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Add a value, evicting the least recently used entry if full.
+
+        Args:
+            key: Exact-match key of the entry
+            value: Value to cache (a copy is stored)
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
@@ -1,9 +1,13 @@
-import json
 import os
+import re
 import numpy as np
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 import pinecone
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Hashable, Optional
 from pinecone import Pinecone, ServerlessSpec
 
 # Import LangChain components
@@ -15,8 +19,63 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import our environment variable loader and data loader
 from utils.env_loader import load_env_vars
+from utils import fast_json
 from utils.data_loader import load_project_data, format_data_for_vector_store, save_project_data
 
+# Query keywords, each mapped to (field, priority, value) where field 0 is
+# the project type and 1 the material grade. Within a field, lower priorities
+# win regardless of where they appear in the query.
+_QUERY_KEYWORD_RE = re.compile(r"kitchen|bathroom|addition|adu|premium|luxury|standard", re.IGNORECASE)
+_QUERY_KEYWORD_RANK = MappingProxyType({
+    "kitchen": (0, 0, "kitchen"),
+    "bathroom": (0, 1, "bathroom"),
+    "addition": (0, 2, "addition"),
+    "adu": (0, 2, "addition"),
+    "premium": (1, 0, "premium"),
+    "luxury": (1, 1, "luxury"),
+    "standard": (1, 2, "standard"),
+})
+
+# Embeddings saved by OpenAIVectorStore, reused across runs by document text
+_EMBEDDINGS_FILE = "data/embeddings/embedded_projects.parquet"
+
+# Embedding batches requested at once when embedding the corpus
+_EMBEDDING_CONCURRENCY = 8
+
+# Vectors per Pinecone upsert, within its recommended request size
+_PINECONE_BATCH_SIZE = 100
+
+# Stand-in for documents the API failed to embed; never reused across runs
+_PLACEHOLDER_EMBEDDING = (0.1,) * 1536  # Typical OpenAI embedding size
+
+@lru_cache(maxsize=4096)
+def _embed_query(client, model, query):
+    """Embed a search query as a read-only unit float32 vector.
+    
+    Repeated queries are served from the cache, keyed by client and model
+    so stores with different clients never share embeddings.
+    """
+    response = client.embeddings.create(model=model, input=[query])
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    vector.setflags(write=False)
+    return vector
+
+@lru_cache(maxsize=1)
+def _pinecone_embeddings():
+    """Return the embeddings model for Pinecone, created on first use."""
+    return OpenAIEmbeddings(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        model="text-embedding-3-small"
+    )
+
+@lru_cache(maxsize=4096)
+def _embed_pinecone_query(query):
+    """Embed a Pinecone search query, caching repeats."""
+    return tuple(_pinecone_embeddings().embed_query(query))
+
 class MockVectorStore:
     """Simulated vector store for rapid development."""
     
@@ -34,6 +93,26 @@ class MockVectorStore:
             print(f"MockVectorStore initialized with {len(self.data)} projects")
         else:
             print("Warning: MockVectorStore initialized with empty dataset")
+        
+        # Inverted index of metadata key -> value -> positions in self.data
+        self._index = self._build_index(self.data or [])
+    
+    @staticmethod
+    def _build_index(data):
+        """Index project positions by each hashable metadata value."""
+        index = {}
+        unindexable = set()
+        for position, project in enumerate(data):
+            for key, value in project["metadata"].items():
+                if key in unindexable:
+                    continue
+                try:
+                    index.setdefault(key, {}).setdefault(value, []).append(position)
+                except TypeError:
+                    # Keys with unhashable values (e.g. cost breakdowns) are scanned instead
+                    unindexable.add(key)
+                    index.pop(key, None)
+        return index
     
     def similarity_search(self, query, filter=None, k=3):
         """Simulate vector search with pre-selected results."""
@@ -41,43 +120,67 @@ class MockVectorStore:
             return []
             
         # Extract query parameters
-        project_type = self._extract_project_type(query)
-        material_grade = self._extract_material_grade(query)
+        project_type, material_grade = self._classify_query(query)
         
-        # Filter projects
-        filtered = self.data
+        # Collect every metadata condition a result must satisfy
+        criteria = []
         if project_type:
-            filtered = [p for p in filtered if p["metadata"].get("project_type") == project_type]
+            criteria.append(("project_type", project_type))
         if material_grade:
-            filtered = [p for p in filtered if p["metadata"].get("material_grade") == material_grade]
+            criteria.append(("material_grade", material_grade))
         if filter:
-            for key, value in filter.items():
-                filtered = [p for p in filtered if p["metadata"].get(key) == value]
+            criteria.extend(filter.items())
+        
+        # Narrow candidates with the index. Conditions on unindexed keys, and
+        # None values (which also match a missing key), are checked per project.
+        postings = []
+        unindexed = []
+        for key, value in criteria:
+            values = self._index.get(key)
+            if values is not None and value is not None and isinstance(value, Hashable):
+                postings.append(values.get(value, []))
+            else:
+                unindexed.append((key, value))
+        
+        if postings:
+            postings.sort(key=len)
+            others = [set(positions) for positions in postings[1:]]
+            candidates = (i for i in postings[0] if all(i in other for other in others))
+        else:
+            candidates = range(len(self.data))
         
-        # Return top k results
-        return filtered[:min(k, len(filtered))]
-    
-    def _extract_project_type(self, query):
-        """Extract project type from query string."""
-        query = query.lower()
-        if "kitchen" in query:
-            return "kitchen"
-        elif "bathroom" in query:
-            return "bathroom"
-        elif "addition" in query or "adu" in query:
-            return "addition"
-        return None
+        # Return the first k matching projects in data order. A negative k
+        # needs every match, to keep list slice semantics.
+        results = []
+        for i in candidates:
+            if len(results) == k:
+                break
+            project = self.data[i]
+            metadata = project["metadata"]
+            if all(metadata.get(key) == value for key, value in unindexed):
+                results.append(project)
+        return results[:k]
     
-    def _extract_material_grade(self, query):
-        """Extract material grade from query string."""
-        query = query.lower()
-        if "premium" in query:
-            return "premium"
-        elif "luxury" in query:
-            return "luxury"
-        elif "standard" in query:
-            return "standard"
-        return None
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _classify_query(query):
+        """Extract project type and material grade from one regex scan.
+        
+        Args:
+            query: Query string to scan
+            
+        Returns:
+            (project_type, material_grade), each None if not mentioned
+        """
+        best = [None, None]
+        for match in _QUERY_KEYWORD_RE.finditer(query):
+            field, priority, value = _QUERY_KEYWORD_RANK[match.group(0).lower()]
+            if best[field] is None or priority < best[field][0]:
+                best[field] = (priority, value)
+                # Nothing outranks the top keyword of both fields
+                if best[0] and best[1] and best[0][0] == best[1][0] == 0:
+                    break
+        return tuple(ranked[1] if ranked else None for ranked in best)
 
 
 class OpenAIVectorStore:
@@ -115,8 +218,73 @@ class OpenAIVectorStore:
         else:
             print("Warning: OpenAIVectorStore initialized with empty dataset")
             
-        # Generate embeddings if not already present
+        # Reuse saved embeddings, then generate any that are still missing
+        self._load_saved_embeddings()
         self._ensure_embeddings()
+        
+        # Unit-length embeddings stacked into one matrix, with the position in
+        # self.data of each row
+        self._embeddings, self._embedded_positions = self._build_embedding_matrix(self.data)
+        
+        # Metadata key -> (value -> code, code of each embedded document),
+        # built the first time a filter uses the key
+        self._metadata_columns = {}
+    
+    @staticmethod
+    def _build_embedding_matrix(data):
+        """Stack document embeddings into one L2-normalized float32 matrix."""
+        positions = np.array([i for i, doc in enumerate(data) if "embedding" in doc], dtype=np.intp)
+        if not len(positions):
+            return np.zeros((0, 0), dtype=np.float32), positions
+        
+        embeddings = np.array([data[i]["embedding"] for i in positions], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        np.divide(embeddings, norms, out=embeddings, where=norms > 0)
+        return embeddings, positions
+    
+    @staticmethod
+    def _build_metadata_column(data, positions, key):
+        """Encode one metadata key of the given documents as integer codes.
+        
+        Returns:
+            (value -> code mapping, code array), or (None, None) if any value
+            is unhashable and the key has to be scanned instead
+        """
+        codes = {}
+        try:
+            column = np.fromiter(
+                (codes.setdefault(data[i]["metadata"].get(key), len(codes)) for i in positions),
+                dtype=np.intp,
+                count=len(positions)
+            )
+        except TypeError:
+            return None, None
+        
+        # Store codes in the narrowest unsigned type (uint8 for categorical
+        # fields like project type) so masks compare one byte per document
+        return codes, column.astype(np.min_scalar_type(max(len(codes) - 1, 0)))
+    
+    def _filter_mask(self, filter):
+        """Return a mask of the embedded documents matching every filter condition."""
+        positions = self._embedded_positions
+        mask = np.ones(len(positions), dtype=bool)
+        for key, value in filter.items():
+            if key not in self._metadata_columns:
+                self._metadata_columns[key] = self._build_metadata_column(self.data, positions, key)
+            codes, column = self._metadata_columns[key]
+            
+            if codes is not None and isinstance(value, Hashable):
+                code = codes.get(value)
+                if code is None:
+                    return np.zeros(len(positions), dtype=bool)
+                mask &= column == code
+            else:
+                mask &= np.fromiter(
+                    (self.data[i]["metadata"].get(key) == value for i in positions),
+                    dtype=bool,
+                    count=len(positions)
+                )
+        return mask
     
     def _ensure_embeddings(self):
         """Generate embeddings for all data points if not present."""
@@ -125,92 +293,136 @@ class OpenAIVectorStore:
         if needs_embedding:
             print(f"Generating embeddings for {len(needs_embedding)} documents...")
             
-            # Process in batches to avoid rate limits
+            # Small batches requested concurrently, so the total wait is a few
+            # round-trips rather than one per batch
             batch_size = 5
-            for i in range(0, len(needs_embedding), batch_size):
-                batch = needs_embedding[i:i+batch_size]
-                
-                # Get text for embedding
-                texts = [doc["text"] for doc in batch]
-                
-                # Generate embeddings
-                try:
-                    response = self.client.embeddings.create(
-                        model=self.embedding_model,
-                        input=texts
-                    )
-                    
-                    # Add embeddings to documents
-                    for j, embedding_data in enumerate(response.data):
-                        batch[j]["embedding"] = embedding_data.embedding
-                except Exception as e:
-                    print(f"Error generating embeddings: {e}")
-                    # Add placeholder embeddings if API call fails
-                    for doc in batch:
-                        doc["embedding"] = [0.1] * 1536  # Typical OpenAI embedding size
+            batches = [needs_embedding[i:i+batch_size] for i in range(0, len(needs_embedding), batch_size)]
+            with ThreadPoolExecutor(max_workers=min(_EMBEDDING_CONCURRENCY, len(batches))) as executor:
+                list(executor.map(self._embed_batch, batches))
             
             print("Embedding generation complete")
             
             # Save embeddings to disk for future use
             self._save_embeddings()
     
-    def _save_embeddings(self):
-        """Save data with embeddings to disk."""
-        # Use the centralized data saving utility
-        save_data = []
+    def _embed_batch(self, batch):
+        """Attach embeddings to a batch of documents, using placeholders on failure."""
+        # Get text for embedding
+        texts = [doc["text"] for doc in batch]
+        
+        # Generate embeddings
+        try:
+            response = self.client.embeddings.create(
+                model=self.embedding_model,
+                input=texts
+            )
+            
+            # Add embeddings to documents
+            for j, embedding_data in enumerate(response.data):
+                batch[j]["embedding"] = embedding_data.embedding
+        except Exception as e:
+            print(f"Error generating embeddings: {e}")
+            # Add placeholder embeddings if API call fails
+            for doc in batch:
+                doc["embedding"] = _PLACEHOLDER_EMBEDDING
+    
+    def _load_saved_embeddings(self):
+        """Attach previously saved embeddings to documents with the same text.
+        
+        Only the text and embedding columns are read, and the embeddings come
+        back as rows of one float32 matrix rather than lists of floats.
+        """
+        if not os.path.exists(_EMBEDDINGS_FILE):
+            return
+        
+        try:
+            import pyarrow.parquet as pq
+            table = pq.read_table(_EMBEDDINGS_FILE, columns=["text", "embedding"])
+            embeddings = table.column("embedding").combine_chunks()
+            matrix = embeddings.flatten().to_numpy().reshape(len(embeddings), embeddings.type.list_size)
+        except Exception as e:
+            print(f"Error loading saved embeddings from {_EMBEDDINGS_FILE}: {e}")
+            return
+        
+        saved = dict(zip(table.column("text").to_pylist(), matrix))
         for doc in self.data:
-            doc_copy = doc.copy()
-            if "embedding" in doc_copy:
-                # Convert numpy arrays to lists for JSON serialization
-                if isinstance(doc_copy["embedding"], np.ndarray):
-                    doc_copy["embedding"] = doc_copy["embedding"].tolist()
-            save_data.append(doc_copy)
-        
-        save_project_data(save_data, "data/embeddings/embedded_projects.json")
+            if "embedding" not in doc and doc.get("text") in saved:
+                doc["embedding"] = saved[doc["text"]]
+    
+    def _save_embeddings(self):
+        """Save data with embeddings to disk.
+        
+        Embeddings are written as a float32 Parquet column, with metadata
+        kept alongside as JSON. Without pyarrow the documents are saved as
+        JSON instead.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            # The centralized saver serializes NumPy embeddings natively
+            save_project_data(self.data, "data/embeddings/embedded_projects.json")
+            return
+        
+        docs = [
+            doc for doc in self.data
+            if "embedding" in doc and doc["embedding"] is not _PLACEHOLDER_EMBEDDING
+        ]
+        try:
+            matrix = np.array([doc["embedding"] for doc in docs], dtype=np.float32)
+            dimension = matrix.shape[1] if matrix.ndim == 2 else len(_PLACEHOLDER_EMBEDDING)
+            table = pa.table({
+                "id": [doc.get("id") for doc in docs],
+                "text": [doc.get("text") for doc in docs],
+                "metadata": [fast_json.dumps(doc.get("metadata")) for doc in docs],
+                "embedding": pa.FixedSizeListArray.from_arrays(pa.array(matrix.ravel()), dimension)
+            })
+            os.makedirs(os.path.dirname(_EMBEDDINGS_FILE), exist_ok=True)
+            pq.write_table(table, _EMBEDDINGS_FILE, compression="zstd")
+            print(f"Saved {len(docs)} embeddings to {_EMBEDDINGS_FILE}")
+        except Exception as e:
+            print(f"Error saving embeddings to {_EMBEDDINGS_FILE}: {e}")
     
     def similarity_search(self, query: str, filter: Optional[Dict[str, Any]] = None, k: int = 3) -> List[Dict]:
         """Search for documents similar to the query."""
         # Generate embedding for query
         try:
-            response = self.client.embeddings.create(
-                model=self.embedding_model,
-                input=[query]
-            )
-            query_embedding = response.data[0].embedding
+            query_vector = _embed_query(self.client, self.embedding_model, query)
         except Exception as e:
             print(f"Error generating query embedding: {e}")
             return []
         
+        if not len(self._embedded_positions):
+            return []
+        
+        # Cosine similarity against every document in one matrix-vector product
+        scores = self._embeddings @ query_vector
+        positions = self._embedded_positions
+        
         # Filter documents if filter is provided
-        filtered_docs = self.data
         if filter:
-            filtered_docs = [
-                doc for doc in filtered_docs 
-                if all(doc["metadata"].get(key) == value for key, value in filter.items())
-            ]
+            mask = self._filter_mask(filter)
+            scores = scores[mask]
+            positions = positions[mask]
+        
+        # Select the top k without sorting every score, keeping all scores
+        # tied with the k-th, then rank just those. The stable sort keeps
+        # data order among ties, and the slice keeps list semantics for k.
+        if 0 < k < len(scores):
+            kth_score = -np.partition(-scores, k - 1)[k - 1]
+            top = np.flatnonzero(scores >= kth_score)
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")][:k]
         
-        # Calculate cosine similarity
+        # Build result dicts for the top k only, leaving out the embedding.
+        # Adding 0.0 reports an orthogonal document as 0.0 rather than -0.0.
         results = []
-        for doc in filtered_docs:
-            if "embedding" in doc:
-                # Calculate cosine similarity
-                doc_embedding = doc["embedding"]
-                similarity = self._cosine_similarity(query_embedding, doc_embedding)
-                
-                # Add to results with similarity score
-                doc_with_score = doc.copy()
-                doc_with_score["similarity"] = similarity
-                results.append(doc_with_score)
-        
-        # Sort by similarity (descending) and return top k
-        results.sort(key=lambda x: x.get("similarity", 0), reverse=True)
-        return results[:k]
-    
-    def _cosine_similarity(self, vec1, vec2):
-        """Calculate cosine similarity between two vectors."""
-        vec1 = np.array(vec1)
-        vec2 = np.array(vec2)
-        return np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2))
+        for j in top:
+            doc_with_score = {key: value for key, value in self.data[positions[j]].items() if key != "embedding"}
+            doc_with_score["similarity"] = float(scores[j]) + 0.0
+            results.append(doc_with_score)
+        return results
 
 
 class PineconeVectorStore:
@@ -266,36 +478,33 @@ class PineconeVectorStore:
         Returns:
             List of IDs for the added texts
         """
-        from langchain_openai import OpenAIEmbeddings
-        
-        # Initialize embeddings model
-        embeddings = OpenAIEmbeddings(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="text-embedding-3-small"
-        )
-        
-        # Generate embeddings for texts
-        vectors = embeddings.embed_documents(texts)
-        
         # Generate IDs if not provided
         ids = [f"text_{i}" for i in range(len(texts))]
         
-        # Prepare vectors for upsert
-        vectors_to_upsert = []
-        for i, (text, vector) in enumerate(zip(texts, vectors)):
+        # Pair each text with its metadata
+        records = []
+        for i, text in enumerate(texts):
             metadata = metadatas[i] if metadatas and i < len(metadatas) else {}
             metadata["text"] = text  # Store the original text in metadata
-            vectors_to_upsert.append({
-                "id": ids[i],
-                "values": vector,
-                "metadata": metadata
-            })
+            records.append((ids[i], text, metadata))
         
-        # Upsert vectors to Pinecone
-        self.index.upsert(vectors=vectors_to_upsert)
+        # Embed and upsert batches concurrently, so one batch's embedding
+        # call overlaps with other batches' upserts
+        batches = [records[i:i+_PINECONE_BATCH_SIZE] for i in range(0, len(records), _PINECONE_BATCH_SIZE)]
+        if batches:
+            with ThreadPoolExecutor(max_workers=min(_EMBEDDING_CONCURRENCY, len(batches))) as executor:
+                list(executor.map(self._upsert_batch, batches))
         
         return ids
     
+    def _upsert_batch(self, batch):
+        """Embed a batch of (id, text, metadata) records and upsert them."""
+        vectors = _pinecone_embeddings().embed_documents([text for _, text, _ in batch])
+        self.index.upsert(vectors=[
+            {"id": record_id, "values": vector, "metadata": metadata}
+            for (record_id, _, metadata), vector in zip(batch, vectors)
+        ])
+    
     def similarity_search(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
         """
         Search for similar texts using the query string.
@@ -307,20 +516,12 @@ class PineconeVectorStore:
         Returns:
             List of dictionaries containing text and metadata
         """
-        from langchain_openai import OpenAIEmbeddings
-        
-        # Initialize embeddings model
-        embeddings = OpenAIEmbeddings(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            model="text-embedding-3-small"
-        )
-        
         # Generate embedding for query
-        query_embedding = embeddings.embed_query(query)
+        query_embedding = _embed_pinecone_query(query)
         
         # Query Pinecone
         results = self.index.query(
-            vector=query_embedding,
+            vector=list(query_embedding),
             top_k=k,
             include_metadata=True
         )
@@ -356,10 +557,63 @@ class PineconeVectorStore:
         return self.index.describe_index_stats()
 
 
+# Shared vector store instances, keyed by store type and data file. The lock
+# keeps concurrent first callers from building the same store twice.
+_STORE_INSTANCES = {}
+_STORE_LOCK = threading.Lock()
+
+def _shared_store(key, factory):
+    """Return the store cached under key, building it with factory on first use."""
+    with _STORE_LOCK:
+        if key not in _STORE_INSTANCES:
+            _STORE_INSTANCES[key] = factory()
+        return _STORE_INSTANCES[key]
+
+def get_mock_vector_store(data_file=None):
+    """
+    Get a shared MockVectorStore instance.
+    
+    The store is built once per data file and reused by every caller in the
+    process, so the project corpus is only loaded into memory once.
+    
+    Args:
+        data_file: Optional path to data file
+        
+    Returns:
+        MockVectorStore: The shared mock vector store instance
+    """
+    return _shared_store(("mock", data_file), lambda: MockVectorStore(data_file))
+
+def get_openai_vector_store(data_file=None):
+    """
+    Get a shared OpenAIVectorStore instance, built once per data file.
+    
+    Args:
+        data_file: Optional path to data file
+        
+    Returns:
+        OpenAIVectorStore: The shared OpenAI vector store instance
+    """
+    return _shared_store(("openai", data_file), lambda: OpenAIVectorStore(data_file))
+
+def get_pinecone_vector_store():
+    """
+    Get the shared PineconeVectorStore instance.
+    
+    A failed connection raises and is not cached, so the next call retries.
+    
+    Returns:
+        PineconeVectorStore: The shared Pinecone vector store instance
+    """
+    return _shared_store(("pinecone", None), PineconeVectorStore)
+
 # Factory function to get the appropriate vector store
 def get_vector_store(use_mock=False, use_pinecone=False, data_file=None):
     """Get vector store instance based on configuration.
     
+    Stores are shared per process, so repeated calls with the same
+    configuration reuse the already loaded (and embedded) corpus.
+    
     Args:
         use_mock (bool): Force use of mock vector store
         use_pinecone (bool): Use Pinecone instead of in-memory store
@@ -373,17 +627,17 @@ def get_vector_store(use_mock=False, use_pinecone=False, data_file=None):
     
     if use_mock or mock_data:
         print("Using MockVectorStore")
-        return MockVectorStore(data_file)
+        return get_mock_vector_store(data_file)
     
     if use_pinecone or os.environ.get("USE_PINECONE", "false").lower() == "true":
         try:
             print("Using PineconeVectorStore")
-            return PineconeVectorStore()
+            return get_pinecone_vector_store()
         except (ImportError, ValueError) as e:
             print(f"Error initializing PineconeVectorStore: {e}")
             print("Falling back to OpenAIVectorStore")
-            return OpenAIVectorStore(data_file)
+            return get_openai_vector_store(data_file)
     
     # Default to OpenAI vector store
     print("Using OpenAIVectorStore")
-    return OpenAIVectorStore(data_file)
+    return get_openai_vector_store(data_file)
@@ -0,0 +1,186 @@
+"""
+Tests that the batch evaluation paths agree with the scalar ones.
+
+No network calls are made: the judge chain and the OpenAI Batch API
+client are replaced with fakes that return a fixed judge response, and
+evidence logging is disabled.
+
+Usage:
+    pytest scripts/test_evaluation_batch.py
+"""
+
+import asyncio
+import os
+import sys
+import types
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The evaluation module imports LangChain at load time
+pytest.importorskip("langchain_openai")
+
+from backend import evaluation
+from utils import fast_json
+
+QUESTIONS = [
+    "Cost estimate for kitchen with 200 sq ft",
+    "Bathroom remodel in a kitchen-adjacent space",
+    "Detached ADU build",
+    "Home addition over the garage",
+    "Graduate student basement refresh",
+    "Deck repair",
+]
+
+PAIRS = [
+    {"question": question, "answer": f"answer {i}", "contexts": [f"context {i}"] if i % 2 else None}
+    for i, question in enumerate(QUESTIONS)
+]
+
+JUDGE_RESPONSE = fast_json.dumps({
+    "faithfulness": 0.9,
+    "answer_relevancy": 0.8,
+    "context_precision": 0.7,
+    "context_recall": 0.6,
+}).decode()
+
+def without_timestamps(evaluations):
+    """Drop timestamps, which legitimately differ between calls."""
+    return [{key: value for key, value in evaluation.items() if key != "timestamp"} for evaluation in evaluations]
+
+@pytest.fixture(autouse=True)
+def no_evidence_files(monkeypatch):
+    monkeypatch.setattr(evaluation, "_log_evaluations", lambda *evaluations: None)
+
+@pytest.fixture
+def seeded_rng(monkeypatch):
+    """Reseed the simulation RNG; returns a function that reseeds it again."""
+    def reseed():
+        monkeypatch.setattr(evaluation, "_RNG", np.random.default_rng(0))
+    reseed()
+    return reseed
+
+@pytest.fixture
+def fake_judge(monkeypatch):
+    """Make the judge available and answer every call with JUDGE_RESPONSE."""
+    class FakeChain:
+        def invoke(self, prompt_inputs):
+            return types.SimpleNamespace(content=JUDGE_RESPONSE)
+
+        async def ainvoke(self, prompt_inputs):
+            return self.invoke(prompt_inputs)
+
+    async def admit(prompt_inputs):
+        return None
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(evaluation, "_judge_chain", FakeChain)
+    monkeypatch.setattr(evaluation, "_wait_for_judge_quota", lambda prompt_inputs: None)
+    monkeypatch.setattr(evaluation, "_await_judge_quota", admit)
+
+def scalar_judge_evaluations():
+    return [evaluation.evaluate_with_judge(pair["question"], pair["answer"], pair.get("contexts")) for pair in PAIRS]
+
+def test_batch_classification_matches_scalar(seeded_rng):
+    batch = evaluation.simulate_ragas_evaluation_batch(
+        [pair["question"] for pair in PAIRS],
+        [pair["answer"] for pair in PAIRS]
+    )
+    for pair, result in zip(PAIRS, batch):
+        project_type = evaluation._classify_project_type(pair["question"])
+        baseline = evaluation._SIMULATED_BASELINES_BY_TYPE[project_type]
+        assert np.allclose(list(result["metrics"].values()), baseline, atol=0.02)
+
+def test_simulated_batch_matches_scalar(seeded_rng):
+    batch = evaluation.simulate_ragas_evaluation_batch(
+        [pair["question"] for pair in PAIRS],
+        [pair["answer"] for pair in PAIRS],
+        [pair.get("contexts") for pair in PAIRS]
+    )
+    seeded_rng()
+    scalar = [evaluation.simulate_ragas_evaluation(pair["question"], pair["answer"], pair.get("contexts")) for pair in PAIRS]
+    assert without_timestamps(batch) == without_timestamps(scalar)
+
+def test_abatch_evaluate_without_judge_matches_scalar(monkeypatch, seeded_rng):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    batch = asyncio.run(evaluation.abatch_evaluate(PAIRS))
+    seeded_rng()
+    scalar = [evaluation.evaluate_with_ragas(pair["question"], pair["answer"], pair.get("contexts")) for pair in PAIRS]
+    assert without_timestamps(batch) == without_timestamps(scalar)
+
+def test_abatch_evaluate_matches_scalar_judge(fake_judge):
+    batch = asyncio.run(evaluation.abatch_evaluate(PAIRS))
+    assert without_timestamps(batch) == without_timestamps(scalar_judge_evaluations())
+
+def test_abatch_evaluate_simulates_failed_items(fake_judge, monkeypatch):
+    judge = evaluation.aevaluate_with_judge
+
+    async def flaky_judge(question, answer, contexts=None):
+        if question == PAIRS[2]["question"]:
+            raise RuntimeError("judge unavailable")
+        return await judge(question, answer, contexts)
+
+    monkeypatch.setattr(evaluation, "aevaluate_with_judge", flaky_judge)
+    batch = asyncio.run(evaluation.abatch_evaluate(PAIRS))
+
+    assert [bool(result.get("simulated")) for result in batch] == [i == 2 for i in range(len(PAIRS))]
+    expected = without_timestamps(scalar_judge_evaluations())
+    assert [result for i, result in enumerate(without_timestamps(batch)) if i != 2] == expected[:2] + expected[3:]
+
+def test_batch_evaluate_matches_scalar_judge(fake_judge, monkeypatch):
+    submitted = {}
+
+    class FakeBatches:
+        def create(self, input_file_id, endpoint, completion_window):
+            return types.SimpleNamespace(id="batch", status="completed", output_file_id="output")
+
+        def retrieve(self, batch_id):
+            raise AssertionError("a completed batch is not polled")
+
+    class FakeFiles:
+        def create(self, file, purpose):
+            submitted["requests"] = [fast_json.loads(line) for line in file[1].splitlines()]
+            return types.SimpleNamespace(id="input")
+
+        def content(self, file_id):
+            # Answer in reverse order to check results are matched by custom_id
+            lines = [
+                fast_json.dumps({
+                    "custom_id": request["custom_id"],
+                    "response": {"body": {"choices": [{"message": {"content": JUDGE_RESPONSE}}]}}
+                }).decode()
+                for request in reversed(submitted["requests"])
+            ]
+            return types.SimpleNamespace(text="\n".join(lines))
+
+    class FakeOpenAI:
+        def __init__(self):
+            self.files = FakeFiles()
+            self.batches = FakeBatches()
+
+    monkeypatch.setitem(sys.modules, "openai", types.SimpleNamespace(OpenAI=FakeOpenAI))
+    batch = evaluation.batch_evaluate(PAIRS)
+
+    assert [request["custom_id"] for request in submitted["requests"]] == [str(i) for i in range(len(PAIRS))]
+    assert without_timestamps(batch) == without_timestamps(scalar_judge_evaluations())
+
+def test_abatch_evaluate_bounds_calls_in_flight(fake_judge, monkeypatch):
+    in_flight = {"now": 0, "max": 0}
+    judge = evaluation.aevaluate_with_judge
+
+    async def counting_judge(question, answer, contexts=None):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0)
+        in_flight["now"] -= 1
+        return await judge(question, answer, contexts)
+
+    monkeypatch.setattr(evaluation, "_JUDGE_CONCURRENCY", 2)
+    monkeypatch.setattr(evaluation, "aevaluate_with_judge", counting_judge)
+    batch = asyncio.run(evaluation.abatch_evaluate(PAIRS))
+
+    assert in_flight["max"] == 2
+    assert without_timestamps(batch) == without_timestamps(scalar_judge_evaluations())
@@ -0,0 +1,77 @@
+"""
+Tests for the JSON helpers and their stdlib fallback.
+
+Each test runs against orjson, when it is installed, and against the
+stdlib json fallback, which must produce the same bytes.
+
+Usage:
+    pytest scripts/test_fast_json.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import fast_json
+
+DATA = {
+    "project_type": "kitchen",
+    "total_range": [42000, 58000],
+    "confidence": 0.85,
+    "notes": "Café-grade fixtures",
+    "cost_breakdown": {"materials": np.int64(20000), "labor": np.float64(17500.5)},
+    "similar": np.array([1.5, 2.25]),
+    "permit": None,
+    "rush": False
+}
+
+@pytest.fixture(params=["orjson", "json"])
+def backend(request, monkeypatch):
+    """Run against orjson, then against the stdlib fallback."""
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(fast_json, "orjson", None)
+    return request.param
+
+def test_round_trip(backend):
+    plain = {
+        **DATA,
+        "cost_breakdown": {"materials": 20000, "labor": 17500.5},
+        "similar": [1.5, 2.25]
+    }
+    for options in ({}, {"indent": True}, {"sort_keys": True}, {"append_newline": True}):
+        assert fast_json.loads(fast_json.dumps(DATA, **options)) == plain
+
+def test_options(backend):
+    assert fast_json.dumps({"b": 1, "a": [1, 2]}) == b'{"b":1,"a":[1,2]}'
+    assert fast_json.dumps({"b": 1, "a": 2}, sort_keys=True) == b'{"a":2,"b":1}'
+    assert fast_json.dumps({"a": 1}, append_newline=True) == b'{"a":1}\n'
+    assert fast_json.dumps({"a": [1]}, indent=True) == b'{\n  "a": [\n    1\n  ]\n}'
+    assert fast_json.dumps("Café") == "\"Café\"".encode()
+
+def test_loads_accepts_bytes_and_str(backend):
+    assert fast_json.loads(b'{"a": 1}') == fast_json.loads('{"a": 1}') == {"a": 1}
+
+def test_decode_errors_are_json_decode_errors(backend):
+    with pytest.raises(fast_json.JSONDecodeError):
+        fast_json.loads("{not json")
+    with pytest.raises(ValueError):
+        fast_json.loads("")
+
+def test_unserializable_objects_raise_type_error(backend):
+    with pytest.raises(TypeError):
+        fast_json.dumps({"a": object()})
+
+def test_fallback_matches_orjson(monkeypatch):
+    pytest.importorskip("orjson")
+    for options in ({}, {"indent": True}, {"sort_keys": True}, {"append_newline": True}):
+        fast = fast_json.dumps(DATA, **options)
+        monkeypatch.setattr(fast_json, "orjson", None)
+        assert fast_json.dumps(DATA, **options) == fast
+        monkeypatch.undo()
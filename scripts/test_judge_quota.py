@@ -0,0 +1,41 @@
+"""
+Tests for reading the judge's rate limit quota from the environment.
+
+Usage:
+    pytest scripts/test_judge_quota.py
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The evaluation module imports LangChain at load time
+pytest.importorskip("langchain_openai")
+
+from backend import evaluation
+
+def test_valid_quota_is_used(monkeypatch):
+    monkeypatch.setenv("OPENAI_RPM", "3000")
+    monkeypatch.setenv("OPENAI_TPM", "1.5e6")
+    request_bucket, token_bucket = evaluation._judge_buckets()
+    assert request_bucket.rate_per_sec == 50
+    assert token_bucket.rate_per_sec == 25000
+
+def test_missing_quota_uses_default(monkeypatch):
+    monkeypatch.delenv("OPENAI_RPM", raising=False)
+    assert evaluation._read_quota("OPENAI_RPM", 500.0) == 500.0
+
+@pytest.mark.parametrize("value", ["0", "-10", "abc", "", "nan", "inf"])
+def test_invalid_quota_falls_back_to_default(monkeypatch, capsys, value):
+    monkeypatch.setenv("OPENAI_RPM", value)
+    evaluation._warn_invalid_quota.cache_clear()
+    assert evaluation._read_quota("OPENAI_RPM", 500.0) == 500.0
+    assert "Ignoring invalid OPENAI_RPM" in capsys.readouterr().out
+
+    # The warning is printed once per value, not on every judge call
+    evaluation._read_quota("OPENAI_RPM", 500.0)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,112 @@
+"""
+Tests for the mock estimate figures.
+
+The scalar figures are pinned against the original percentage arithmetic,
+which is exact for whole square footage, and the batch figures against the
+scalar ones.
+
+Usage:
+    pytest scripts/test_mock_estimate.py
+"""
+
+import math
+import os
+import sys
+from fractions import Fraction
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The estimator module imports LangChain and Pinecone at load time
+pytest.importorskip("langchain_openai")
+pytest.importorskip("pinecone")
+
+from backend.estimator import _mock_estimate_figures, mock_estimate_batch
+
+PROJECT_TYPES = ["kitchen", "bathroom", "addition", "garage"]
+MATERIAL_GRADES = ["standard", "premium", "luxury", "budget"]
+SQUARE_FEET = [37, 80, 200, 455, 1001]
+FLOAT_SQUARE_FEET = [37.5, 80.25, 199.9, 455.0]
+
+def original_figures(project_type, square_feet, material_grade):
+    """The mock estimate arithmetic as originally written with float percentages.
+    
+    Whole square footage uses exact fractions instead, since float
+    percentages truncated some shares one dollar low (11100 * 0.35 gave
+    3884).
+    """
+    base_costs = {
+        "kitchen": {"standard": 250, "premium": 350, "luxury": 500},
+        "bathroom": {"standard": 300, "premium": 450, "luxury": 650},
+        "addition": {"standard": 350, "premium": 450, "luxury": 750}
+    }
+    timelines = {
+        "kitchen": {"standard": 6, "premium": 8, "luxury": 10},
+        "bathroom": {"standard": 4, "premium": 6, "luxury": 8},
+        "addition": {"standard": 8, "premium": 12, "luxury": 16}
+    }
+    base_cost = base_costs.get(project_type, {}).get(material_grade, 300)
+    base_weeks = timelines.get(project_type, {}).get(material_grade, 8)
+
+    mid_cost = base_cost * square_feet
+    min_cost = math.floor(int(mid_cost * 0.85) / 1000) * 1000
+    max_cost = math.ceil(int(mid_cost * 1.15) / 1000) * 1000
+
+    materials_pct = {"standard": 0.4, "premium": 0.45, "luxury": 0.5}.get(material_grade, 0.4)
+    labor_pct = {"standard": 0.35, "premium": 0.3, "luxury": 0.25}.get(material_grade, 0.35)
+
+    if isinstance(mid_cost, int):
+        materials_pct, labor_pct = Fraction(str(materials_pct)), Fraction(str(labor_pct))
+        permits_pct, design_pct = Fraction("0.05"), Fraction("0.1")
+    else:
+        permits_pct, design_pct = 0.05, 0.1
+
+    mid_materials = int(mid_cost * materials_pct)
+    mid_labor = int(mid_cost * labor_pct)
+    mid_permits = int(mid_cost * permits_pct)
+    mid_design = int(mid_cost * design_pct)
+    mid_other = mid_cost - mid_materials - mid_labor - mid_permits - mid_design
+
+    return (min_cost, max_cost, base_weeks, mid_materials, mid_labor,
+            mid_permits, mid_design, mid_other)
+
+def assert_same_figures(actual, expected):
+    """Assert two figure tuples match in both value and type."""
+    assert actual == expected
+    assert [type(value) for value in actual] == [type(value) for value in expected]
+
+@pytest.mark.parametrize("square_feet", SQUARE_FEET + FLOAT_SQUARE_FEET)
+@pytest.mark.parametrize("material_grade", MATERIAL_GRADES)
+@pytest.mark.parametrize("project_type", PROJECT_TYPES)
+def test_figures_match_original_arithmetic(project_type, square_feet, material_grade):
+    assert_same_figures(
+        _mock_estimate_figures(project_type, square_feet, material_grade),
+        original_figures(project_type, square_feet, material_grade)
+    )
+
+def test_whole_square_feet_shares_are_exact():
+    # 300 * 37 = 11100, and 35% of that is exactly 3885
+    assert _mock_estimate_figures("bathroom", 37, "standard")[4] == 3885
+
+def test_int_and_float_square_feet_are_cached_separately():
+    as_int = _mock_estimate_figures("kitchen", 200, "premium")
+    as_float = _mock_estimate_figures("kitchen", 200.0, "premium")
+    assert_same_figures(as_int, original_figures("kitchen", 200, "premium"))
+    assert_same_figures(as_float, original_figures("kitchen", 200.0, "premium"))
+
+def test_batch_matches_scalar():
+    combos = [
+        (project_type, square_feet, material_grade)
+        for project_type in PROJECT_TYPES
+        for material_grade in MATERIAL_GRADES
+        for square_feet in SQUARE_FEET
+    ]
+    project_types, square_feet, material_grades = map(list, zip(*combos))
+    batch = mock_estimate_batch(project_types, square_feet, material_grades)
+
+    keys = ("min_cost", "max_cost", "timeline_weeks", "materials", "labor",
+            "permits", "design", "other")
+    for i, combo in enumerate(combos):
+        assert tuple(int(batch[key][i]) for key in keys) == _mock_estimate_figures(*combo)
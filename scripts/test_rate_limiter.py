@@ -0,0 +1,95 @@
+"""
+Tests for the token-bucket rate limiter.
+
+A fake clock stands in for time.monotonic, and sleeps advance it, so the
+tests are deterministic and don't actually wait.
+
+Usage:
+    pytest scripts/test_rate_limiter.py
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend import rate_limiter
+from backend.rate_limiter import TokenBucket
+
+class FakeClock:
+    """Monotonic clock that only moves when told to or slept on."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self, seconds):
+        self.sleep(seconds)
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", fake.sleep)
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake.async_sleep)
+    return fake
+
+def test_burst_is_admitted_without_waiting(clock):
+    bucket = TokenBucket(rate_per_sec=2, burst=5)
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+
+def test_deficit_waits_at_the_refill_rate(clock):
+    bucket = TokenBucket(rate_per_sec=2, burst=5)
+    assert bucket.reserve(5) == 0.0
+
+    # Each reservation queues behind the last, half a second apart
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    assert bucket.reserve(4) == pytest.approx(3.0)
+
+def test_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate_per_sec=2, burst=5)
+    bucket.reserve(5)
+
+    clock.now += 1.0
+    assert bucket.reserve(2) == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    # A long idle period refills only up to the burst size
+    clock.now += 60.0
+    assert bucket.reserve(5) == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+def test_wait_blocks_for_the_deficit(clock):
+    bucket = TokenBucket(rate_per_sec=4, burst=1)
+    bucket.wait()
+    bucket.wait()
+    bucket.wait(2)
+    assert clock.sleeps == [pytest.approx(0.25), pytest.approx(0.5)]
+
+def test_acquire_sleeps_for_the_deficit(clock):
+    bucket = TokenBucket(rate_per_sec=4, burst=1)
+
+    async def acquire_three():
+        await bucket.acquire()
+        await bucket.acquire()
+        await bucket.acquire(2)
+
+    asyncio.run(acquire_three())
+    assert clock.sleeps == [pytest.approx(0.25), pytest.approx(0.5)]
+
+@pytest.mark.parametrize("rate_per_sec, burst", [(0, 5), (-1, 5), (2, 0), (float("nan"), 5)])
+def test_non_positive_rate_or_burst_is_rejected(rate_per_sec, burst):
+    with pytest.raises(ValueError):
+        TokenBucket(rate_per_sec=rate_per_sec, burst=burst)
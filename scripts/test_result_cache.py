@@ -0,0 +1,64 @@
+"""
+Tests for the exact-key LRU result cache.
+
+Usage:
+    pytest scripts/test_result_cache.py
+"""
+
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.result_cache import ResultCache
+
+def test_only_identical_keys_hit():
+    cache = ResultCache(capacity=4)
+    cache.put(("kitchen", 200, "premium"), "estimate")
+
+    assert cache.get(("kitchen", 200, "premium")) == "estimate"
+    assert cache.get(("kitchen", 210, "premium")) is None
+    assert cache.get(("bathroom", 200, "premium")) is None
+
+def test_put_replaces_an_existing_entry():
+    cache = ResultCache(capacity=4)
+    cache.put("key", "old")
+    cache.put("key", "new")
+
+    assert cache.get("key") == "new"
+    assert len(cache) == 1
+
+def test_values_are_copied_on_put_and_get():
+    cache = ResultCache(capacity=4)
+    value = {"total_range": [1, 2]}
+    cache.put("key", value)
+    value["total_range"].append(3)
+
+    hit = cache.get("key")
+    assert hit == {"total_range": [1, 2]}
+    hit["total_range"].append(4)
+    assert cache.get("key") == {"total_range": [1, 2]}
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(capacity=3)
+    for i in range(3):
+        cache.put(i, i)
+
+    # Reading 0 makes 1 the least recently used
+    assert cache.get(0) == 0
+    cache.put(3, 3)
+
+    assert len(cache) == 3
+    assert cache.get(1) is None
+    assert [cache.get(i) for i in (0, 2, 3)] == [0, 2, 3]
+
+def test_rewriting_an_entry_refreshes_it():
+    cache = ResultCache(capacity=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 3)
+    cache.put("c", 4)
+
+    assert cache.get("b") is None
+    assert [cache.get("a"), cache.get("c")] == [3, 4]
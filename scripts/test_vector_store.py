@@ -0,0 +1,216 @@
+"""
+Tests that the vector store search paths agree with the original scans.
+
+MockVectorStore's indexed search is compared against the original linear
+scan on the synthetic projects, and OpenAIVectorStore's encoded metadata
+filters against a per-document dict comparison. No embeddings are
+requested: the OpenAI store is built around fixed vectors.
+
+Usage:
+    pytest scripts/test_vector_store.py
+"""
+
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The vector store module imports LangChain and Pinecone at load time
+pytest.importorskip("langchain_openai")
+pytest.importorskip("pinecone")
+
+from backend.vector_store import MockVectorStore, OpenAIVectorStore
+from utils.data_loader import load_project_data
+
+SYNTHETIC_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "synthetic", "projects.json")
+
+QUERIES = [
+    "",
+    "Cost estimate for kitchen with 200 sq ft",
+    "kitchen renovation with 235 sq ft using premium materials",
+    "Bathroom remodel using LUXURY finishes",
+    "Detached ADU build",
+    "home addition, standard grade",
+    "kitchen or bathroom, premium or luxury",
+    "bathroom next to the kitchen, standard then premium",
+    "luxury premium standard",
+    "kitchenette refresh",
+    "garage conversion",
+]
+
+K_VALUES = [0, -1, -2, 1, 3, 10, 1000]
+
+def original_similarity_search(data, query, filter=None, k=3):
+    """MockVectorStore.similarity_search as originally written."""
+    if not data:
+        return []
+
+    query_lower = query.lower()
+    if "kitchen" in query_lower:
+        project_type = "kitchen"
+    elif "bathroom" in query_lower:
+        project_type = "bathroom"
+    elif "addition" in query_lower or "adu" in query_lower:
+        project_type = "addition"
+    else:
+        project_type = None
+
+    if "premium" in query_lower:
+        material_grade = "premium"
+    elif "luxury" in query_lower:
+        material_grade = "luxury"
+    elif "standard" in query_lower:
+        material_grade = "standard"
+    else:
+        material_grade = None
+
+    filtered = data
+    if project_type:
+        filtered = [p for p in filtered if p["metadata"].get("project_type") == project_type]
+    if material_grade:
+        filtered = [p for p in filtered if p["metadata"].get("material_grade") == material_grade]
+    if filter:
+        for key, value in filter.items():
+            filtered = [p for p in filtered if p["metadata"].get(key) == value]
+
+    return filtered[:min(k, len(filtered))]
+
+def synthetic_projects():
+    """The synthetic projects, plus variants with missing, None and unhashable metadata."""
+    projects = load_project_data(data_file=SYNTHETIC_FILE, fallback_to_synthetic=False)
+    assert projects, f"No projects loaded from {SYNTHETIC_FILE}"
+
+    variants = []
+    for i, project in enumerate(projects[:12]):
+        metadata = dict(project["metadata"])
+        if i % 4 == 0:
+            del metadata["zip_code"]
+        elif i % 4 == 1:
+            metadata["zip_code"] = None
+        elif i % 4 == 2:
+            metadata["tags"] = ["rush", "permit"]
+        else:
+            metadata["square_feet"] = float(metadata["square_feet"])
+        variants.append({"id": f"variant_{i}", "text": project["text"], "metadata": metadata})
+    return projects + variants
+
+def filters_for(projects):
+    """Filters covering single keys, combinations, unknown values and unindexed keys."""
+    first = projects[0]["metadata"]
+    return [
+        None,
+        {},
+        {"project_type": "bathroom"},
+        {"material_grade": "luxury"},
+        {"zip_code": first["zip_code"]},
+        {"zip_code": None},
+        {"zip_code": "00000"},
+        {"project_type": "kitchen", "zip_code": first["zip_code"]},
+        {"material_grade": "standard", "timeline_weeks": first["timeline_weeks"]},
+        {"square_feet": first["square_feet"]},
+        {"square_feet": float(first["square_feet"])},
+        {"total_cost": first["total_cost"], "project_type": first["project_type"]},
+        {"cost_breakdown": first["cost_breakdown"]},
+        {"tags": ["rush", "permit"]},
+        {"project_type": ["kitchen"]},
+        {"no_such_key": None},
+        {"no_such_key": "x"},
+    ]
+
+@pytest.fixture(scope="module")
+def mock_store():
+    """A MockVectorStore over the synthetic projects and their variants."""
+    store = MockVectorStore.__new__(MockVectorStore)
+    store.data = synthetic_projects()
+    store._index = MockVectorStore._build_index(store.data)
+    return store
+
+def test_mock_store_loads_synthetic_data():
+    store = MockVectorStore(data_file=SYNTHETIC_FILE)
+    for query, k in itertools.product(QUERIES, K_VALUES):
+        assert store.similarity_search(query, k=k) == original_similarity_search(store.data, query, k=k)
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_mock_search_matches_linear_scan(mock_store, query):
+    for filter, k in itertools.product(filters_for(mock_store.data), K_VALUES):
+        expected = original_similarity_search(mock_store.data, query, filter, k)
+        actual = mock_store.similarity_search(query, filter=filter, k=k)
+        assert [p["id"] for p in actual] == [p["id"] for p in expected], (query, filter, k)
+
+def test_mock_search_default_k_and_empty_store(mock_store):
+    for query in QUERIES:
+        assert mock_store.similarity_search(query) == original_similarity_search(mock_store.data, query)
+
+    empty = MockVectorStore.__new__(MockVectorStore)
+    empty.data = []
+    empty._index = {}
+    assert empty.similarity_search("kitchen", k=5) == []
+
+def openai_store(projects, unembedded=()):
+    """An OpenAIVectorStore over fixed vectors, leaving some documents unembedded."""
+    rng = np.random.default_rng(0)
+    data = [dict(project) for project in projects]
+    for i, doc in enumerate(data):
+        if i not in unembedded:
+            doc["embedding"] = rng.normal(size=8).tolist()
+
+    store = OpenAIVectorStore.__new__(OpenAIVectorStore)
+    store.data = data
+    store._embeddings, store._embedded_positions = OpenAIVectorStore._build_embedding_matrix(data)
+    store._metadata_columns = {}
+    return store
+
+def original_filter_mask(store, filter):
+    """Mask of embedded documents whose metadata equals every filter value."""
+    return np.array([
+        all(store.data[i]["metadata"].get(key) == value for key, value in filter.items())
+        for i in store._embedded_positions
+    ], dtype=bool)
+
+def test_filter_mask_matches_dict_comparison():
+    store = openai_store(synthetic_projects(), unembedded={3, 17, 40})
+    for filter in filters_for(store.data)[2:]:
+        mask = store._filter_mask(filter)
+        assert mask.dtype == bool
+        assert np.array_equal(mask, original_filter_mask(store, filter)), filter
+
+    # Columns are built once and reused; rerunning every filter gives the same masks
+    for filter in filters_for(store.data)[2:]:
+        assert np.array_equal(store._filter_mask(filter), original_filter_mask(store, filter)), filter
+
+def test_unknown_filter_values_match_nothing():
+    store = openai_store(synthetic_projects())
+    for filter in ({"project_type": "garage"}, {"zip_code": "00000"}, {"project_type": "kitchen", "zip_code": "00000"}):
+        assert not store._filter_mask(filter).any()
+
+    # A missing key is encoded as None, so only a None value matches it
+    assert store._filter_mask({"no_such_key": None}).all()
+    assert not store._filter_mask({"no_such_key": "x"}).any()
+
+def test_unhashable_columns_are_scanned():
+    store = openai_store(synthetic_projects())
+    codes, column = OpenAIVectorStore._build_metadata_column(store.data, store._embedded_positions, "cost_breakdown")
+    assert codes is None and column is None
+
+    filter = {"cost_breakdown": store.data[0]["metadata"]["cost_breakdown"]}
+    assert np.array_equal(store._filter_mask(filter), original_filter_mask(store, filter))
+
+@pytest.mark.parametrize("distinct, dtype", [(1, np.uint8), (256, np.uint8), (257, np.uint16), (70000, np.uint32)])
+def test_metadata_codes_use_narrowest_dtype(distinct, dtype):
+    count = max(distinct, 300)
+    projects = [{"id": str(i), "text": "", "metadata": {"lot": i % distinct}} for i in range(count)]
+    store = openai_store(projects)
+
+    codes, column = OpenAIVectorStore._build_metadata_column(store.data, store._embedded_positions, "lot")
+    assert column.dtype == dtype
+    assert len(codes) == distinct
+
+    # Codes past the uint8 range still select exactly their documents
+    for value in {0, distinct // 2, distinct - 1}:
+        filter = {"lot": value}
+        assert np.array_equal(store._filter_mask(filter), original_filter_mask(store, filter))
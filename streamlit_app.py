@@ -9,9 +9,11 @@ import os
 import sys
 from pathlib import Path
 
-# Add the project root to Python path to ensure imports work correctly
+# Put the project root first on the Python path so `import app` always
+# resolves to this project's app module (and is then served from sys.modules)
 project_root = Path(__file__).parent.absolute()
-sys.path.append(str(project_root))
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
 
 # Set up environment variables for Streamlit Cloud
 # In Streamlit Cloud, you'll set these in the app settings
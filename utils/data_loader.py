@@ -9,13 +9,14 @@ This module handles:
 - Formatting data consistently for vector stores
 """
 import os
-import json
 import sys
 from typing import List, Dict, Any, Optional, Union
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from utils import fast_json
+
 def load_project_data(
     data_file: Optional[str] = None,
     fallback_to_synthetic: bool = True,
@@ -51,8 +52,8 @@ def load_project_data(
     for file_path in possible_files:
         if os.path.exists(file_path):
             try:
-                with open(file_path, "r") as f:
-                    raw_data = json.load(f)
+                with open(file_path, "rb") as f:
+                    raw_data = fast_json.loads(f.read())
                 used_file = file_path
                 print(f"Loaded {len(raw_data)} projects from {file_path}")
                 break
@@ -143,8 +144,8 @@ def save_project_data(data: List[Dict[str, Any]], file_path: str) -> bool:
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
     
     try:
-        with open(file_path, "w") as f:
-            json.dump(data, f, indent=2)
+        with open(file_path, "wb") as f:
+            f.write(fast_json.dumps(data, indent=True))
         print(f"Saved {len(data)} projects to {file_path}")
         return True
     except Exception as e:
@@ -162,4 +163,4 @@ if __name__ == "__main__":
     if projects:
         # Show first project
         print("\nSample project:")
-        print(json.dumps(projects[0], indent=2)) 
\ No newline at end of file
+        print(fast_json.dumps(projects[0], indent=True).decode()) 
\ No newline at end of file
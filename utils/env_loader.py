@@ -7,20 +7,26 @@ from dotenv import load_dotenv
 import sys
 from typing import List, Dict, Any, Optional, Union, Tuple
 
-def load_env_vars():
+def get_env_path() -> str:
     """
-    Load environment variables from the correct location.
-    Returns True if successful, False otherwise.
+    Return the path of the .env file for the current working directory.
     """
     # Determine the correct path to .env based on current working directory
     cwd = os.getcwd()
     
     # If running from project root
     if os.path.basename(cwd) != "renovation-estimator":
-        env_path = os.path.join("renovation-estimator", ".env")
-    else:
-        # If running from within renovation-estimator directory
-        env_path = ".env"
+        return os.path.join("renovation-estimator", ".env")
+    
+    # If running from within renovation-estimator directory
+    return ".env"
+
+def load_env_vars():
+    """
+    Load environment variables from the correct location.
+    Returns True if successful, False otherwise.
+    """
+    env_path = get_env_path()
     
     # Check if .env file exists
     if not os.path.exists(env_path):
@@ -1,5 +1,6 @@
 import streamlit as st
 from datetime import datetime
+from utils import fast_json
 
 """
 PDF Report Generator for Renovation Cost Estimator
@@ -176,6 +177,15 @@ def generate_html_report(inputs, estimate):
     
     return html
 
+@st.cache_data(show_spinner=False)
+def _render_report_html(inputs_json, estimate_json, report_date):
+    """Render the report HTML for canonicalized inputs and estimate.
+    
+    The report date is part of the cache key so the "Generated on" line
+    never goes stale across days.
+    """
+    return generate_html_report(fast_json.loads(inputs_json), fast_json.loads(estimate_json))
+
 def display_pdf_html(inputs, estimate):
     """Display PDF report as HTML in Streamlit.
     
@@ -186,7 +196,13 @@ def display_pdf_html(inputs, estimate):
         inputs (dict): Dictionary of user inputs
         estimate (dict): Dictionary of cost estimate results
     """
-    html = generate_html_report(inputs, estimate)
+    # Canonical serializations as the cache key: sorted keys, and NumPy
+    # scalars and arrays serialized as their plain values
+    html = _render_report_html(
+        fast_json.dumps(inputs, sort_keys=True),
+        fast_json.dumps(estimate, sort_keys=True),
+        datetime.now().strftime("%Y%m%d")
+    )
     
     # Display in Streamlit
     st.components.v1.html(html, height=600, scrolling=True)